@@ -28,9 +28,15 @@ Original version can be found at https://github.com/letuananh/pyinkscape
 
 ########################################################################
 
+import copy
+import functools
 import logging
 import os
+import stat
+import sys
+import tempfile
 import typing as tp
+from types import MappingProxyType
 from xml.dom.minidom import Element
 
 from lxml import etree
@@ -44,25 +50,64 @@ logger.setLevel(logging.INFO)
 
 INKSCAPE_NS = "http://www.inkscape.org/namespaces/inkscape"
 SVG_NS = "http://www.w3.org/2000/svg"
-SVG_NAMESPACES = {
-    "ns": SVG_NS,
-    "svg": SVG_NS,
-    "dc": "http://purl.org/dc/elements/1.1/",
-    "cc": "http://creativecommons.org/ns#",
-    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
-    "sodipodi": "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
-    "inkscape": INKSCAPE_NS,
-}
+SVG_NAMESPACES = MappingProxyType(
+    {
+        "ns": SVG_NS,
+        "svg": SVG_NS,
+        "dc": "http://purl.org/dc/elements/1.1/",
+        "cc": "http://creativecommons.org/ns#",
+        "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+        "sodipodi": "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+        "inkscape": INKSCAPE_NS,
+    }
+)
 XLINK_NS = "http://www.w3.org/1999/xlink"
 
+# Namespace-qualified names, built once rather than formatted in hot loops
+SVG_ANY = sys.intern(f"{{{SVG_NS}}}*")
+SVG_TEXT = sys.intern(f"{{{SVG_NS}}}text")
+SVG_TSPAN = sys.intern(f"{{{SVG_NS}}}tspan")
+XLINK_HREF = sys.intern(f"{{{XLINK_NS}}}href")
+
+# Process umask, read once: reading it requires setting it, which is not
+# thread-safe
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _get_output_mode(path: str) -> int:
+    # mode `open(path, "wb")` would give: kept for existing files, else the
+    # default mode filtered by the umask
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_cached_file(
+    filepath: str, mtime_ns: int, remove_blank_text: bool, encoding: str
+):
+    # the blank canvas and files opened with `cached=True` are parsed once per
+    # modification time, instances work on deep copies of the parsed tree
+    with open(filepath, "rb") as infile:
+        return etree.parse(
+            infile,
+            XMLParser(remove_blank_text=remove_blank_text, encoding=encoding),
+        )
+
 
 class Point:
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
 
 
 class Dimension:
+    __slots__ = ("width", "height")
+
     def __init__(self, width, height):
         self.width = width
         self.height = height
@@ -71,25 +116,19 @@ class Dimension:
 class BBox:
     """A bounding box represents by a top-left anchor (x1, y1) and a dimension (width, height)"""
 
-    def __init__(self, x, y, width, height):
-        self._anchor = Point(x, y)
-        self._dimension = Dimension(width, height)
-
-    @property
-    def width(self):
-        """Width of the bounding box"""
-        return self._dimension.width
+    __slots__ = ("x", "y", "width", "height")
 
-    @property
-    def height(self):
-        """Height of the bounding box"""
-        return self._dimension.height
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
 
 
 class Canvas:
     """This class represents an Inkscape drawing page (i.e. a SVG file)."""
 
-    def __init__(self, filepath=tp.Optional[str], *args, **kwargs):
+    def __init__(self, filepath: tp.Optional[str] = None, *args, **kwargs):
         """Create a new blank canvas or read from an existing file.
 
         To create a blank canvas, just ignore the filepath property.
@@ -98,6 +137,9 @@ class Canvas:
         To open an existing file, use
         >>> c = Canvas("/path/to/file.svg")
 
+        To open a file that is opened many times, e.g. a template, use
+        >>> c = Canvas("/path/to/file.svg", cached=True)
+
         Arguments:
             filepath: Path to an existing SVG file.
         """
@@ -111,32 +153,70 @@ class Canvas:
         self._scale = 1.0
         self._elem_group_map = {}
         self._elements_by_ids = {}
-        if filepath is not None:
-            self._load_file(*args, **kwargs)
+        self._duplicated_ids = set()
+        self._load_file(*args, **kwargs)
 
-    def _load_file(self, remove_blank_text=True, encoding="utf-8", **kwargs):
+    def _load_file(
+        self, remove_blank_text=True, encoding="utf-8", cached=False, **kwargs
+    ):
+        self._elements_by_ids = {}
+        self._duplicated_ids = set()
+        if not kwargs and (cached or not self._filepath):
+            filepath = (
+                os.path.realpath(self._filepath) if self._filepath else _BLANK_CANVAS
+            )
+            tree = _parse_cached_file(
+                filepath,
+                os.stat(filepath).st_mtime_ns,
+                remove_blank_text,
+                encoding,
+            )
+            self._tree = copy.deepcopy(tree)
+            self._root = self._tree.getroot()
+            for element in self._root.iterdescendants(SVG_ANY):
+                self._index_element(element)
+            self._update_svg_info()
+            return
         with open(
-            _BLANK_CANVAS if not self._filepath else self._filepath,
-            encoding=encoding,
+            _BLANK_CANVAS if not self._filepath else self._filepath, "rb"
         ) as infile:
             kwargs["remove_blank_text"] = remove_blank_text  # lxml specific
-            parser = XMLParser(**kwargs)
-            self._tree = etree.parse(infile, parser)
-            self._root = self._tree.getroot()
+            # index SVG elements while parsing, in a single pass
+            context = etree.iterparse(
+                infile,
+                events=("start",),
+                tag=SVG_ANY,
+                encoding=encoding,
+                **kwargs,
+            )
+            for _, element in context:
+                if self._root is None:
+                    self._root = element
+                else:
+                    self._index_element(element)
+            self._tree = self._root.getroottree()
             self._update_svg_info()
 
     def _update_svg_info(self):
         # load SVG information
-        if self._svg_node.get("viewBox"):
-            self._viewbox = BBox(
-                *(float(x) for x in self._svg_node.get("viewBox").split())
-            )
-            if not self._width:
-                self._width = self._viewbox.width
-            if not self._height:
-                self._width = self._viewbox.height
-        if self.viewBox and self._width:
-            self._scale = self.viewBox.width / self._width
+        viewbox = self._svg_node.get("viewBox")
+        if viewbox:
+            x, y, width, height = (float(value) for value in viewbox.split())
+            self._viewbox = BBox(x, y, width, height)
+            self._width = self._width or width
+            self._height = self._height or height
+        if self._viewbox and self._width:
+            self._scale = self._viewbox.width / self._width
+
+    def _index_element(self, element):
+        # index SVG elements by id, so that lookups don't walk the tree
+        element_id = element.get("id")
+        if not element_id:
+            return
+        if element_id in self._elements_by_ids:
+            self._duplicated_ids.add(element_id)
+        else:
+            self._elements_by_ids[element_id] = element
 
     @property
     def _svg_node(self):
@@ -146,16 +226,18 @@ class Canvas:
     def viewBox(self):
         return self._viewbox
 
-    def to_xml_string(self, encoding="utf-8", pretty_print=True, **kwargs):
+    def to_xml_bytes(self, encoding="utf-8", pretty_print=False, **kwargs):
         return etree.tostring(
             self._root,
             encoding=encoding,
             pretty_print=pretty_print,
             **kwargs,
-        ).decode("utf-8")
+        )
 
-    def _xpath_query(self, query_string, namespaces=None):
-        return self._root.xpath(query_string, namespaces=namespaces)
+    def to_xml_string(self, encoding="utf-8", pretty_print=True, **kwargs):
+        return self.to_xml_bytes(
+            encoding=encoding, pretty_print=pretty_print, **kwargs
+        ).decode(encoding)
 
     def element_by_id(self, id: str) -> tp.Optional[Element]:
         """Get one XML element by its ID.
@@ -166,18 +248,37 @@ class Canvas:
         Raises:
             RuntimeError: when more than two elements share the exact same ID
         """
-        elements = self._xpath_query(f".//ns:*[@id='{id}']", namespaces=SVG_NAMESPACES)
-        if not elements:
-            return None
-        if len(elements) > 1:
-            raise RuntimeError(f"Found {len(elements)} elements with the same id {id}")
-        return elements[0]
+        if id in self._duplicated_ids:
+            raise RuntimeError(f"Found several elements with the same id {id}")
+        return self._elements_by_ids.get(id)
 
     def render(self, outpath, overwrite=False, encoding="utf-8"):
-        if not overwrite and os.path.isfile(outpath):
-            logger.warning(f"File {outpath} exists. SKIPPED")
+        # Serialized first, so that a serialization error never creates a file
+        output = self.to_xml_bytes(encoding=encoding, pretty_print=False)
+        # The existence check and the creation are a single atomic open when
+        # not overwriting; overwrites go through a temporary file and a rename
+        if overwrite:
+            fd, writepath = tempfile.mkstemp(
+                suffix=".tmp", dir=os.path.dirname(outpath) or "."
+            )
         else:
-            output = self.to_xml_string(pretty_print=False)
-            with open(outpath, mode="w", encoding=encoding) as outfile:
+            writepath = outpath
+            try:
+                fd = os.open(
+                    writepath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666
+                )
+            except FileExistsError:
+                logger.warning(f"File {outpath} exists. SKIPPED")
+                return
+        try:
+            with os.fdopen(fd, mode="wb") as outfile:
+                if overwrite:
+                    # mkstemp creates files only readable by their owner
+                    os.fchmod(outfile.fileno(), _get_output_mode(outpath))
                 outfile.write(output)
-                logger.info("Written output to {}".format(outfile.name))
+            if overwrite:
+                os.replace(writepath, outpath)
+        except BaseException:
+            os.unlink(writepath)
+            raise
+        logger.info("Written output to {}".format(outpath))
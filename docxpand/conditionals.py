@@ -1,28 +1,89 @@
-import random
 import typing as tp
+from types import MappingProxyType
+
+import numpy as np
+
+DEFAULT_BIRTH_NAME_PROBABILITY_BY_GENDER = MappingProxyType(
+    {"male": 0.05, "female": 0.2, "nonbinary": 0.2}
+)
+
+
+class UniformPool:
+    """Uniform values in [0, 1), drawn by batches from a NumPy generator."""
+
+    def __init__(self, seed: tp.Optional[int] = None, size: int = 1 << 14):
+        self._size = size
+        self.seed(seed)
+
+    def seed(self, seed: tp.Optional[int] = None) -> None:
+        self._rng = np.random.default_rng(seed)
+        self._refill()
+
+    def _refill(self) -> None:
+        self._pool = self._rng.random(self._size)
+        self._index = 0
+
+    def next(self) -> float:
+        if self._index >= self._size:
+            self._refill()
+        value = self._pool[self._index]
+        self._index += 1
+        return value
+
+    def take(self, count: int) -> np.ndarray:
+        """Take the next `count` values of the pool, in the order of `next`."""
+        chunks = []
+        while count > 0:
+            if self._index >= self._size:
+                self._refill()
+            end = min(self._index + count, self._size)
+            chunks.append(self._pool[self._index:end])
+            count -= end - self._index
+            self._index = end
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+class StandardNormalPool(UniformPool):
+    """Standard normal values, drawn by batches from a NumPy generator."""
+
+    def _refill(self) -> None:
+        self._pool = self._rng.standard_normal(self._size)
+        self._index = 0
 
 
 class Conditional:
-    def __init__(seed: tp.Optional[int] = None):
-        if seed is not None:
-            random.seed(seed)
+    """Base class for conditions deciding whether a field is generated.
 
-    @staticmethod
-    def uniform(probability: float = 0.5) -> bool:
-        return random.random() <= probability
+    Instances created without seed share a per-process pool of uniform values;
+    instances created with a seed get their own, reproducible, pool. When
+    generating in several processes, each worker must call `Conditional.seed`
+    with its own seed, otherwise forked workers draw the same values.
+    """
+
+    _shared_pool = UniformPool()
+
+    def __init__(self, seed: tp.Optional[int] = None):
+        self._pool = (
+            Conditional._shared_pool if seed is None else UniformPool(seed)
+        )
 
     @staticmethod
-    def maybe(**kwargs) -> bool:
+    def seed(seed: tp.Optional[int] = None) -> None:
+        Conditional._shared_pool.seed(seed)
+
+    def uniform(self, probability: float = 0.5) -> bool:
+        return bool(self._pool.next() <= probability)
+
+    def maybe(self, **kwargs) -> bool:
         raise NotImplementedError("Must be implemented in child class")
 
 
 class BirthNameConditional(Conditional):
-    @staticmethod
-    def maybe(**kwargs) -> bool:
-        gender: str = kwargs.get("gender", "nonbinary")
+    def maybe(self, **kwargs) -> bool:
         probability_by_gender = kwargs.get(
-            "probability_by_gender",
-            {"male": 0.05, "female": 0.2, "nonbinary": 0.2},
+            "probability_by_gender", DEFAULT_BIRTH_NAME_PROBABILITY_BY_GENDER
+        )
+        probability = probability_by_gender.get(
+            kwargs.get("gender", "nonbinary"), 0.2
         )
-        probability = probability_by_gender.get(gender, 0.2)
-        return Conditional.uniform(probability)
+        return self.uniform(probability)
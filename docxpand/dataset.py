@@ -3,13 +3,121 @@
 import datetime
 import getpass
 import json
+import mmap
 import numpy as np
 import os
 import typing as tp
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 from pydantic import BaseModel, Field
 
 from docxpand.image import ColorSpace, Image
+from docxpand.utils import iso_utc_now
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MMAP_MIN_SIZE = 1 << 20
+"""Minimum size (in bytes) of a JSON file to decode it from a memory map."""
+
+
+def _load_json(path: str) -> tp.Any:
+    """Load a JSON file, using orjson when it is available.
+
+    With orjson, big files are decoded from a read-only memory map rather than
+    being copied into an intermediate buffer.
+
+    Args:
+        path: path to the JSON file
+
+    Returns:
+        the decoded JSON content
+    """
+    if orjson is None:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < MMAP_MIN_SIZE:
+            return orjson.loads(file.read())
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+
+def _json_default(value: tp.Any) -> tp.Any:
+    """Serialize the values that are not natively supported by JSON encoders.
+
+    Numpy values are converted to python values, dates to ISO 8601 strings,
+    and any other value to its string representation. With orjson, this is
+    only called for types it does not support natively.
+
+    Args:
+        value: the value to serialize
+
+    Returns:
+        a JSON serializable value
+    """
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dump_json(content: tp.Any, path: str) -> None:
+    """Write some content to a JSON file, using orjson when it is available.
+
+    Keys are sorted and indented with 2 spaces; unsupported values are
+    serialized by `_json_default`.
+
+    Args:
+        content: the content to serialize
+        path: path to the JSON file
+    """
+    if orjson is None:
+        with open(path, "w") as file:
+            json.dump(
+                content, file, indent=2, sort_keys=True, default=_json_default
+            )
+        return
+    data = orjson.dumps(
+        content,
+        default=_json_default,
+        option=(
+            orjson.OPT_INDENT_2
+            | orjson.OPT_SORT_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+        ),
+    )
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def read_image(
+    filepath: str,
+    space: ColorSpace = ColorSpace.BGR,
+    ignore_orientation: bool = True,
+) -> Image:
+    """Read a document image.
+
+    This is a module-level function, so that it can be sent to worker
+    processes without pickling a whole dataset.
+
+    Args:
+        filepath: path to the image file
+        space: the target color space of the image
+        ignore_orientation: if True, ignores the orientation flag in EXIF
+            metadata; else it is used to rotate the image accordingly
+
+    Returns:
+        the read image
+    """
+    return Image.read(filepath, space=space, ignore_orientation=ignore_orientation)
 
 
 class PointModel(BaseModel):
@@ -43,6 +151,30 @@ class QuadrangleModel(BaseModel):
     p4: PointModel
     """Fourth (and last) point of the quadrangle."""
 
+    @classmethod
+    def validate(cls, value: tp.Any) -> "QuadrangleModel":
+        """Validate a quadrangle, also accepting a (4, 2) coordinates array."""
+        if isinstance(value, (np.ndarray, list, tuple)):
+            points = np.asarray(value, dtype=np.float64).reshape(4, 2)
+            value = {
+                f"p{index}": {"x": x, "y": y}
+                for index, (x, y) in enumerate(points.tolist(), start=1)
+            }
+        return super().validate(value)
+
+    @property
+    def points_array(self) -> np.ndarray:
+        """Return the coordinates of the points as a (4, 2) array."""
+        return np.array(
+            [
+                [self.p1.x, self.p1.y],
+                [self.p2.x, self.p2.y],
+                [self.p3.x, self.p3.y],
+                [self.p4.x, self.p4.y],
+            ],
+            dtype=np.float64,
+        )
+
 
 class BaseDocumentModel(BaseModel):
     """Typing for data stored in `BaseDatasetModel.documents`.
@@ -77,6 +209,9 @@ class BaseDocumentModel(BaseModel):
     document is saved using this filename.
     """
 
+    class Config:
+        allow_population_by_field_name = True  # accept `_id` or `id`
+
 
 class BaseAnnotationModel(BaseModel):
     """Typing for data stored in any annotation."""
@@ -93,6 +228,9 @@ class BaseAnnotationModel(BaseModel):
     updated_at: datetime.datetime
     """The date when the annotation has been last updated"""
 
+    class Config:
+        allow_population_by_field_name = True
+
 
 class DocFakerAnnotationModel(BaseAnnotationModel):
     """Typing for data stored in `DocFakerDocumentModel.annotations`."""
@@ -153,14 +291,20 @@ class BaseDataset:
         _info: a copy of info contained in `dataset`, or some very basic info
             dictionary with placeholder name and description, and generated
             author and creation date.
-        documents: a look-up table between document identifiers and documents
+        documents: a look-up table between document identifiers and documents,
+            kept as raw dictionaries
+        _validated_files: the (model, path, modification time, size) of
+            dataset files already validated, used when `validate_once` is set
     """
 
+    _validated_files: tp.Set[tp.Tuple[type, str, int, int]] = set()
+
     def __init__(
         self,
         dataset_input: tp.Union[str, dict],
         images_dir: str,
         validate: bool = True,
+        validate_once: bool = False,
     ):
         """Init a dataset module from a path to a json file.
 
@@ -173,31 +317,47 @@ class BaseDataset:
                 dictionary
             validate: Validate a dataset using pydantic. Defaults to True.
             images_dir: path to folder where to store images. Defaults to None.
+            validate_once: when loading from a file, skip the validation if
+                the same unchanged file has already been validated in this
+                process. Defaults to False.
         """
         self.dataset = (
-            json.load(open(dataset_input, "r", encoding="utf-8"))
+            _load_json(dataset_input)
             if isinstance(dataset_input, str)
             else dataset_input
         )
 
         # validate dataset is in the correct format
         if validate:
-            self._validate()
+            if validate_once and isinstance(dataset_input, str):
+                stat = os.stat(dataset_input)
+                file_key = (
+                    self._model,
+                    os.path.realpath(dataset_input),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+                if file_key not in BaseDataset._validated_files:
+                    self._validate()
+                    BaseDataset._validated_files.add(file_key)
+            else:
+                self._validate()
 
         # set images_dir, this where images will be downloaded
         self.images_dir = images_dir
 
         # set basic properties of a dataset
-        self._info = self.dataset.get(
-            "info",
-            {
+        # (the placeholder info is only built when the dataset has none)
+        if "info" in self.dataset:
+            self._info = self.dataset["info"]
+        else:
+            self._info = {
                 "name": "basic_dataset",
-                "createdAt": datetime.datetime.utcnow().isoformat(),
+                "createdAt": iso_utc_now(),
                 "description": "basic_dataset_description",
                 "author": getpass.getuser(),
-            },
-        )
-        self.documents: tp.Dict[str, BaseDocumentModel] = dict()
+            }
+        self.documents: tp.Dict[str, tp.Dict[str, tp.Any]] = dict()
         self._create_index()
         self._seed = None
 
@@ -207,14 +367,17 @@ class BaseDataset:
         return BaseDatasetModel
 
     def _validate(self) -> None:
-        """Validate dataset dictionary using pydantic validators."""
+        """Validate dataset dictionary using pydantic validators.
+
+        The parsed models are discarded: documents are kept as the raw
+        dictionaries of the dataset.
+        """
         self._model.parse_obj(self.dataset)
 
     def _create_index(self) -> None:
         """Index the dataset documents to make them easily accessible."""
-        self.documents = {
-            document["_id"]: document for document in self.dataset["documents"]
-        }
+        documents = self.dataset["documents"]
+        self.documents = dict(zip(map(itemgetter("_id"), documents), documents))
 
     def info(self) -> tp.Dict[str, tp.Any]:
         """Print information about the dataset."""
@@ -245,8 +408,7 @@ class BaseDataset:
             "__class__": f"{cls.__module__}.{cls.__qualname__}",
         }
         dataset_copy.update(self.dataset)
-        with open(export_path, "w") as file:
-            json.dump(dataset_copy, file, indent=2, sort_keys=True, default=str)
+        _dump_json(dataset_copy, export_path)
 
     def load_image(
         self,
@@ -269,8 +431,68 @@ class BaseDataset:
         Returns:
             np.ndarray image
         """
-        filepath = os.path.join(self.images_dir, self.documents[document_id].filename)
-        return Image.read(filepath, space=space, ignore_orientation=ignore_orientation)
+        return read_image(
+            self.image_path(document_id),
+            space=space,
+            ignore_orientation=ignore_orientation,
+        )
+
+    def image_path(self, document_id: str) -> str:
+        """Return the path of the image of a document.
+
+        Args:
+            document_id: _id of the document in dataset.
+
+        Returns:
+            the path of the document image
+        """
+        return os.path.join(self.images_dir, self.documents[document_id]["filename"])
+
+    def iter_images(
+        self,
+        document_ids: tp.Iterable[str],
+        prefetch: int = 8,
+        space: ColorSpace = ColorSpace.BGR,
+        ignore_orientation: bool = True,
+    ) -> tp.Iterator[tp.Tuple[str, Image]]:
+        """Load document images in order, reading the next ones in background.
+
+        Up to `prefetch` images are read by a pool of threads while the caller
+        processes the current one, so that disk reads and decoding overlap
+        with the processing.
+
+        Args:
+            document_ids: _id of the documents to load, in order.
+            prefetch: number of images read in advance. Defaults to 8.
+            space: the target color space of the images.
+                Defaults to ColorSpace.BGR.
+            ignore_orientation: if True, ignores the orientation flag
+                    in EXIF metadata; else it is used to rotate the image
+                    accordingly. Defaults to True.
+
+        Yields:
+            (document_id, image) tuples
+        """
+        with ThreadPoolExecutor(max_workers=max(prefetch, 1)) as executor:
+            pending: tp.Deque = deque()
+            for document_id in document_ids:
+                pending.append(
+                    (
+                        document_id,
+                        executor.submit(
+                            read_image,
+                            self.image_path(document_id),
+                            space,
+                            ignore_orientation,
+                        ),
+                    )
+                )
+                if len(pending) > prefetch:
+                    done_id, future = pending.popleft()
+                    yield done_id, future.result()
+            while pending:
+                done_id, future = pending.popleft()
+                yield done_id, future.result()
 
 
 class DocFakerDataset(BaseDataset):
@@ -281,6 +503,7 @@ class DocFakerDataset(BaseDataset):
         dataset_input: tp.Union[str, dict],
         validate: bool = True,
         images_dir: tp.Optional[str] = None,
+        validate_once: bool = False,
     ):
         """Init a dataset module from a path to a json file or python dict.
 
@@ -294,6 +517,9 @@ class DocFakerDataset(BaseDataset):
                 Defaults to True.
             images_dir: path to folder where to store images.
                 Defaults to None.
+            validate_once: when loading from a file, skip the validation if
+                the same unchanged file has already been validated in this
+                process. Defaults to False.
             dataset_cache_dir: optional cache dir for downloaded dataset
                 from minIO
         """
@@ -301,6 +527,7 @@ class DocFakerDataset(BaseDataset):
             dataset_input,
             validate=validate,
             images_dir=images_dir,
+            validate_once=validate_once,
         )
 
     @property
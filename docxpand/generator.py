@@ -1,15 +1,26 @@
-import datetime
+import bisect
+import concurrent.futures
+import itertools
+import logging
 import os
+import random
 import typing as tp
 import uuid
 
+import cv2
 import numpy as np
 from faker import Faker
 
-from docxpand.canvas import SVG_NS, XLINK_NS, Canvas
+from docxpand.canvas import SVG_TEXT, SVG_TSPAN, XLINK_HREF, Canvas
+from docxpand.conditionals import Conditional
 from docxpand.image import Image
 from docxpand.instantiable import CallableInstantiable
-from docxpand.providers import GENERIC_FAKER, ChoiceProvider
+from docxpand.providers import (
+    GENERIC_FAKER,
+    ChoiceProvider,
+    HeightProvider,
+    get_faker,
+)
 from docxpand.svg_to_image import SVGRenderer
 from docxpand.template import (
     TEMPLATES_DIR,
@@ -18,6 +29,153 @@ from docxpand.template import (
     FieldType,
 )
 from docxpand.translations.labels import LABELS_TRANSLATION
+from docxpand.utils import iso_utc_now
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELD_TYPES = frozenset(
+    {
+        FieldType.ADDRESS,
+        FieldType.DATE,
+        FieldType.MRZ,
+        FieldType.NAME,
+        FieldType.TEXT,
+    }
+)
+IMAGE_FIELD_TYPES = frozenset({FieldType.PHOTO})
+
+# OpenCV encoding parameters by image format: generated images favor
+# encoding speed over file size
+WRITE_PARAMS = {
+    "jpg": [],
+    "png": [cv2.IMWRITE_PNG_COMPRESSION, 1],
+}
+
+# Maximum number of times the parts of a name are drawn before giving up
+MAX_NAME_ATTEMPTS = 100
+
+
+def _whole_document_position() -> tp.Dict[str, tp.Dict[str, float]]:
+    """Get the position of a document covering its whole image.
+
+    A new dict is returned on each call, as entries may be modified later.
+
+    Returns:
+        the relative position of the document corners
+    """
+    return {
+        "p1": {"x": 0.0, "y": 0.0},
+        "p2": {"x": 1.0, "y": 0.0},
+        "p3": {"x": 1.0, "y": 1.0},
+        "p4": {"x": 0.0, "y": 1.0},
+    }
+
+
+def _element_id(
+    field_name: str, element_type: str, line_idx: tp.Optional[int] = None
+) -> str:
+    """Get the id of the SVG element of a field, label or image.
+
+    Args:
+        field_name: the name of the field or label
+        element_type: "field", "label" or "image"
+        line_idx: index of the line, for multi-line fields
+
+    Returns:
+        the id of the SVG element
+    """
+    element_id = f"{field_name}_{element_type}"
+    if line_idx is not None:
+        element_id = f"{element_id}_{line_idx + 1}"
+    return element_id
+
+
+# Generator of the current worker process, see `Generator.generate_dataset`
+_WORKER_GENERATOR: tp.Optional["Generator"] = None
+
+
+def document_seeds(
+    seed: tp.Optional[int], number: int
+) -> tp.Iterator[tp.Optional[int]]:
+    """Derive the seeds of successive documents from the seed of a dataset.
+
+    Args:
+        seed: the seed of the dataset, None for unseeded generation
+        number: number of documents
+
+    Returns:
+        iterator over the seeds of the documents, all None if `seed` is None
+    """
+    if seed is None:
+        return itertools.repeat(None, number)
+    # `np.random.seed` only accepts 32-bit seeds
+    return ((seed + index) % (1 << 32) for index in range(number))
+
+
+def seed_random_generators(seed: tp.Optional[int] = None) -> None:
+    """Seed all the random generators used when generating documents.
+
+    Generated values are drawn from the Faker and NumPy generators and from the
+    pools of `Conditional` and `HeightProvider`. The global `random` generator
+    is seeded too, but its state may be consumed by third-party libraries (e.g.
+    the `regex` cache, when `dateparser` loads its data on first use).
+
+    Args:
+        seed: the seed, None to seed them from OS entropy
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    Faker.seed(seed)
+    Conditional.seed(seed)
+    HeightProvider.seed(seed)
+
+
+def _init_worker(
+    template: DocumentTemplate,
+    renderer_factory: tp.Optional[tp.Callable[[], SVGRenderer]],
+    photo_url_request: str,
+) -> None:
+    """Build the generator of a worker process, and reseed random generators.
+
+    Args:
+        template: the template of the documents to generate
+        renderer_factory: callable building the SVG renderer, if any
+        photo_url_request: URL used to generate identity photos
+    """
+    global _WORKER_GENERATOR
+    # Forked workers inherit the random states of their parent
+    seed_random_generators()
+    _WORKER_GENERATOR = Generator(
+        template,
+        renderer_factory() if renderer_factory else None,
+        photo_url_request,
+    )
+
+
+def _generate_worker(
+    output_directory: str, seed: tp.Optional[int] = None
+) -> tp.List[tp.Dict]:
+    """Generate a document with the generator of the worker process.
+
+    Args:
+        output_directory: directory where images are stored
+        seed: seed of the document, None to continue with the current states
+            of the random generators of the worker
+
+    Returns:
+        list of output entries, empty if the generation failed
+    """
+    assert _WORKER_GENERATOR is not None
+    if seed is not None:
+        seed_random_generators(seed)
+    try:
+        return _WORKER_GENERATOR.generate_images(output_directory)
+    except Exception as err:
+        logger.warning(
+            f"Got an error while generating images ({type(err)}: {err}), "
+            "continuing..."
+        )
+        return []
 
 
 class Generator:
@@ -34,6 +192,112 @@ class Generator:
             else DocumentTemplate.load(template)
         )
         self.renderer = renderer
+        self._plan = self._build_plan()
+        self._side_templates = {
+            side_name: os.path.join(
+                TEMPLATES_DIR,
+                os.path.dirname(self.template.filename),
+                side.template,
+            )
+            for side_name, side in self.template.sides.items()
+        }
+        self._side_fields = {
+            side_name: {field.name: field for field in side.fields}
+            for side_name, side in self.template.sides.items()
+        }
+        self._element_ids = self._build_element_ids()
+        self._label_translations: tp.Dict[
+            tp.Tuple[str, tp.Optional[str]], tp.Dict[str, str]
+        ] = {}
+
+    def _build_element_ids(
+        self,
+    ) -> tp.Dict[tp.Tuple[str, str, tp.Optional[int]], str]:
+        """Build the ids of the SVG elements filled for every document.
+
+        Returns:
+            the element ids, by (field name, element type, line index)
+        """
+        keys = []
+        for side in self.template.sides.values():
+            keys.extend((label, "label", None) for label in side.translatable_labels)
+            for field in side.fields:
+                if field.type in IMAGE_FIELD_TYPES:
+                    keys.append((field.name, "image", None))
+                elif field.lines and field.lines > 1:
+                    keys.extend(
+                        (field.name, "field", line_idx)
+                        for line_idx in range(field.lines)
+                    )
+                else:
+                    keys.append((field.name, "field", None))
+        return {key: _element_id(*key) for key in keys}
+
+    def _get_label_translations(
+        self, side_name: str, locale: tp.Optional[str]
+    ) -> tp.Dict[str, str]:
+        """Get the translations of the labels of a side, computed once per locale.
+
+        Args:
+            side_name: the name of the side
+            locale: the locale of the document
+
+        Returns:
+            the translation of each translatable label, when it exists
+        """
+        key = (side_name, locale)
+        translations = self._label_translations.get(key)
+        if translations is None:
+            translations = {}
+            for label_name in self.template.sides[side_name].translatable_labels:
+                label_translation = LABELS_TRANSLATION.get(
+                    label_name, {}
+                ).get(locale, None)
+                if label_translation:
+                    translations[label_name] = label_translation
+            self._label_translations[key] = translations
+        return translations
+
+    def _build_plan(
+        self,
+    ) -> tp.Dict[str, tp.List[tp.Tuple[Field, tp.Callable, bool]]]:
+        """Build, for each side, the list of fields with their generator.
+
+        Each generator is called with the field, the faker, the already
+        generated fields and the context, whatever its field type.
+
+        Returns:
+            for each side, a list of (field, generator, uses name locale)
+        """
+        handlers = {
+            FieldType.NAME: lambda field, faker, data, context: (
+                self.generate_name(field, faker, context)
+            ),
+            FieldType.DATE: self.generate_date,
+            FieldType.ADDRESS: lambda field, faker, data, context: (
+                self.generate_address(field, faker, context)
+            ),
+            FieldType.TEXT: self.generate_text,
+            FieldType.PHOTO: lambda field, faker, data, context: (
+                self.generate_photo(field, data, context)
+            ),
+            FieldType.MRZ: lambda field, faker, data, context: (
+                self.generate_mrz(field, data, context)
+            ),
+        }
+        plan = {}
+        for side_name, side in self.template.sides.items():
+            plan[side_name] = []
+            for field in side.fields:
+                handler = handlers.get(field.type)
+                if handler is None:
+                    raise RuntimeError(
+                        f"Field type {field.type} not currently supported"
+                    )
+                plan[side_name].append(
+                    (field, handler, field.type == FieldType.NAME)
+                )
+        return plan
 
     def generate_name(
         self,
@@ -48,13 +312,18 @@ class Generator:
         method = CallableInstantiable.get_methods(
             field.provider, generator=faker, **context
         )
-        generated_lines = self.generate_multi_line_multi_part(
-            method, nb_parts, separator, nb_lines, max_chars_per_line
-        )
-        while not generated_lines:
+        # Parts may all be empty, in which case new ones are drawn
+        for _ in range(MAX_NAME_ATTEMPTS):
             generated_lines = self.generate_multi_line_multi_part(
                 method, nb_parts, separator, nb_lines, max_chars_per_line
             )
+            if generated_lines:
+                break
+        else:
+            raise ValueError(
+                f"No line generated for field {field.name} after "
+                f"{MAX_NAME_ATTEMPTS} attempts."
+            )
         if nb_lines == 1:
             return generated_lines[0]
         return generated_lines
@@ -75,22 +344,29 @@ class Generator:
         complete_value = separator.join(parts)
         if nb_lines == 1:
             return [complete_value[:max_chars_per_line]]
+        first_part = parts[0] if parts else None
         lines = []
+        separator_length = len(separator)
         for _ in range(nb_lines):
-            partial_value = None
-            for selected in range(len(parts)):
-                candidate = separator.join(parts[: selected + 1]) + separator
-                if len(candidate) > max_chars_per_line:
-                    break
-                partial_value = candidate
-            if partial_value:
+            # Length of each prefix of parts, followed by a separator
+            cumulative_lengths = list(
+                itertools.accumulate(len(part) + separator_length for part in parts)
+            )
+            selected = bisect.bisect_right(cumulative_lengths, max_chars_per_line)
+            if selected:
+                partial_value = separator.join(parts[:selected]) + separator
                 lines.append(partial_value.strip())
-            parts = parts[selected + 1 :]
+                parts = parts[selected:]
+            else:
+                parts = parts[1:]
             if not parts:
                 break
 
         if lines:
             lines[-1] = lines[-1].strip(separator)
+        elif first_part:
+            # No part fits on a line, truncate the first one
+            lines.append(first_part[:max_chars_per_line].strip(separator))
         return lines
 
     def generate_address(
@@ -151,10 +427,10 @@ class Generator:
         existing_fields: tp.Dict,
         context: tp.Dict,
     ) -> np.ndarray:
-        context_copy = context.copy()
-        context_copy["url"] = self.photo_url_request
         return CallableInstantiable.call(
-            field.provider, existing_fields=existing_fields, **context_copy
+            field.provider,
+            existing_fields=existing_fields,
+            **{**context, "url": self.photo_url_request},
         )
 
     def generate_mrz(
@@ -186,21 +462,22 @@ class Generator:
         # Initialize generated data
         data = {}
 
+        # Pick fakers once, according to the context
+        if "locale" in context:
+            faker = get_faker(context["locale"])
+        else:
+            faker = GENERIC_FAKER
+        if "name_locale" in context:
+            name_faker = get_faker(context["name_locale"])
+        else:
+            name_faker = faker
+
         # Iterate on sides
-        for side in self.template.sides:
+        for side, fields in self._plan.items():
             data[side] = {}
 
             # Iterate on fields
-            for field in self.template.sides[side].fields:
-                if field.type == FieldType.NAME and "name_locale" in context:
-                    faker = Faker(context["name_locale"])
-                elif "locale" in context:
-                    faker = Faker(context["locale"])
-                else:
-                    faker = GENERIC_FAKER
-
-                values = None
-
+            for field, generate, uses_name_locale in fields:
                 # Check if field should be generated or not
                 if field.conditional is not None:
                     if not CallableInstantiable.call(
@@ -210,23 +487,12 @@ class Generator:
                         continue
 
                 # Generate field value according to type
-                if field.type == FieldType.NAME:
-                    values = self.generate_name(field, faker, context)
-                elif field.type == FieldType.DATE:
-                    values = self.generate_date(field, faker, data, context)
-                elif field.type == FieldType.ADDRESS:
-                    values = self.generate_address(field, faker, context)
-                elif field.type == FieldType.TEXT:
-                    values = self.generate_text(field, faker, data, context)
-                elif field.type == FieldType.PHOTO:
-                    values = self.generate_photo(field, data, context)
-                elif field.type == FieldType.MRZ:
-                    values = self.generate_mrz(field, data, context)
-                else:
-                    raise RuntimeError(
-                        f"Field type {field.type} not currently supported"
-                    )
-                data[side][field.name] = values
+                data[side][field.name] = generate(
+                    field,
+                    name_faker if uses_name_locale else faker,
+                    data,
+                    context,
+                )
 
         return data, context
 
@@ -237,16 +503,16 @@ class Generator:
         field_values: tp.Union[str, tp.List[str]],
         line_idx: tp.Optional[int] = None,
         element_type="field",
+        element_id: tp.Optional[str] = None,
     ) -> None:
-        element_id = f"{field_name}_{element_type}"
-        if line_idx is not None:
-            element_id = f"{element_id}_{line_idx + 1}"
+        if element_id is None:
+            element_id = _element_id(field_name, element_type, line_idx)
         text_element = canvas.element_by_id(element_id)
-        if text_element is None or text_element.tag != f"{{{SVG_NS}}}text":
+        if text_element is None or text_element.tag != SVG_TEXT:
             print(f"Cannot get text element from id {element_id}, ignoring.")
             return
         tspan = text_element[0]
-        if tspan.tag != f"{{{SVG_NS}}}tspan":
+        if tspan.tag != SVG_TSPAN:
             raise RuntimeError(
                 "Cannot get tspan from text element with id " f"{element_id}"
             )
@@ -264,14 +530,17 @@ class Generator:
         field_name: str,
         field_values: Image,
         format: str = "png",
+        element_id: tp.Optional[str] = None,
     ) -> None:
-        element_id = f"{field_name}_image"
+        if element_id is None:
+            element_id = _element_id(field_name, "image")
         image_element = canvas.element_by_id(element_id)
         if image_element is None:
             print(f"Cannot get image element from id {element_id}, ignoring.")
             return
-        href_key = f"{{{XLINK_NS}}}href"
-        image_element.attrib[href_key] = field_values.base64encode(format)
+        image_element.attrib[XLINK_HREF] = field_values.base64encode(
+            format, WRITE_PARAMS.get(format)
+        )
 
     def generate_images(
         self,
@@ -310,71 +579,80 @@ class Generator:
         # Iterate on sides
         output_filenames = []
         entries = []
+        creation_date = iso_utc_now()
+        template_name = self.template.name
+        element_ids = self._element_ids
+        to_render = []
         for side_name in self.template.sides:
             output_fields[side_name] = {}
             # Get SVG template
-            side = self.template.sides[side_name]
-            filename = os.path.join(
-                TEMPLATES_DIR,
-                os.path.dirname(self.template.filename),
-                side.template,
-            )
-            canvas = Canvas(filename)
-
-            for label_name in side.translatable_labels:
-                label_translation = LABELS_TRANSLATION.get(
-                    label_name, {}
-                ).get(locale, None)
-                if label_translation:
-                    self.fill_text_field(
-                        canvas,
-                        label_name,
-                        label_translation,
-                        element_type="label",
-                    )
+            side_fields = self._side_fields[side_name]
+            canvas = Canvas(self._side_templates[side_name], cached=True)
+            side_prefix = f"{document_id}-{template_name}-{side_name}"
+
+            label_translations = self._get_label_translations(side_name, locale)
+            for label_name, label_translation in label_translations.items():
+                self.fill_text_field(
+                    canvas,
+                    label_name,
+                    label_translation,
+                    element_type="label",
+                    element_id=element_ids[(label_name, "label", None)],
+                )
             for field_name in generated_fields[side_name]:
                 # Get element
-                field = side.get_field(field_name)
+                field = side_fields[field_name]
                 field_values = generated_fields[side_name][field_name]
 
                 # Case of text fields
-                if field.type in [
-                    FieldType.ADDRESS,
-                    FieldType.DATE,
-                    FieldType.MRZ,
-                    FieldType.NAME,
-                    FieldType.TEXT,
-                ]:
+                if field.type in TEXT_FIELD_TYPES:
                     if field.lines and field.lines > 1:
                         for line_idx in range(field.lines):
                             self.fill_text_field(
-                                canvas, field_name, field_values, line_idx
+                                canvas,
+                                field_name,
+                                field_values,
+                                line_idx,
+                                element_id=element_ids[
+                                    (field_name, "field", line_idx)
+                                ],
                             )
                     else:
-                        self.fill_text_field(canvas, field_name, field_values)
+                        self.fill_text_field(
+                            canvas,
+                            field_name,
+                            field_values,
+                            element_id=element_ids[(field_name, "field", None)],
+                        )
                     output_fields[side_name][field_name] = {
                         "type": "text",
                         "value": field_values
                     }
 
                 # Case of image fields
-                elif field.type in [
-                    FieldType.PHOTO,
-                ]:
-                    self.fill_image_field(canvas, field_name, field_values)
-                    format = formats.get(field_name.lower(), formats["default"])
-                    factor = factors.get(field_name.lower(), factors["default"])
-                    height, width = map(
-                        lambda x: int(x*factor), field_values.shape[:2]
+                elif field.type in IMAGE_FIELD_TYPES:
+                    self.fill_image_field(
+                        canvas,
+                        field_name,
+                        field_values,
+                        element_id=element_ids[(field_name, "image", None)],
                     )
-                    image_filename = (
-                        f"{document_id}-{self.template.name}-{side_name}-"
-                        f"{field_name}.{format}"
+                    lowered_name = field_name.lower()
+                    format = formats.get(lowered_name, formats["default"])
+                    factor = factors.get(lowered_name, factors["default"])
+                    original_height, original_width = field_values.shape[:2]
+                    height = int(original_height * factor)
+                    width = int(original_width * factor)
+                    image_filename = f"{side_prefix}-{field_name}.{format}"
+                    # Resizing is already done by OpenCV, only skip no-ops
+                    if (height, width) == (original_height, original_width):
+                        field_image = field_values
+                    else:
+                        field_image = field_values.resize(height, width)
+                    field_image.write(
+                        os.path.join(output_directory, image_filename),
+                        WRITE_PARAMS.get(format),
                     )
-                    field_image = field_values.resize(height, width)
-                    field_image.write(os.path.join(
-                        output_directory, image_filename
-                    ))
                     output_fields[side_name][field_name] = {
                         "type": "image",
                         "filename": image_filename
@@ -384,23 +662,18 @@ class Generator:
                         f"Field type {field.type} not currently supported"
                     )
 
-            output_filename = os.path.join(
-                output_directory,
-                f"{document_id}-{self.template.name}-{side_name}.svg",
-            )
-            output_filename = os.path.join(
-                output_directory,
-                f"{document_id}-{self.template.name}-{side_name}.svg",
-            )
-            canvas.render(output_filename, True)
             if self.renderer:
-                png_output = output_filename.replace(".svg", ".png")
-                img = self.renderer.render(output_filename)
-                img.write(png_output)
-                os.remove(output_filename)
-                output_filename = png_output
+                # Sides are rendered together, once all of them are filled
+                output_filename = os.path.join(
+                    output_directory, f"{side_prefix}.png"
+                )
+                to_render.append(canvas.to_xml_bytes())
+            else:
+                output_filename = os.path.join(
+                    output_directory, f"{side_prefix}.svg"
+                )
+                canvas.render(output_filename, True)
             output_filenames.append(output_filename)
-            creation_date = datetime.datetime.utcnow().isoformat()
             entries.append(
                 {
                     "_id": f"{document_id}-{side_name}",
@@ -410,17 +683,74 @@ class Generator:
                             "annotator": "automatic",
                             "created_at": creation_date,
                             "fields": output_fields,
-                            "position": {
-                                "p1": {"x": 0.0, "y": 0.0},
-                                "p2": {"x": 1.0, "y": 0.0},
-                                "p3": {"x": 1.0, "y": 1.0},
-                                "p4": {"x": 0.0, "y": 1.0},
-                            },
-                            "template": f"{self.template.name}-{side_name}",
+                            "position": _whole_document_position(),
+                            "template": f"{template_name}-{side_name}",
                             "updated_at": creation_date,
                         }
                     ],
                     "filename": os.path.basename(output_filename),
                 }
             )
+        if to_render:
+            images = self.renderer.render_many(to_render)
+            for img, output_filename in zip(images, output_filenames):
+                img.write(output_filename)
+        return entries
+
+    def generate_dataset(
+        self,
+        number: int,
+        output_directory: str,
+        workers: tp.Optional[int] = None,
+        renderer_factory: tp.Optional[tp.Callable[[], SVGRenderer]] = None,
+        seed: tp.Optional[int] = None,
+    ) -> tp.List[tp.Dict]:
+        """Generate many documents in parallel, using a pool of processes.
+
+        Each process builds its own generator once. Documents that cannot be
+        generated are skipped with a warning. When a seed is given, each
+        document is generated with its own seed derived from it, so that the
+        generated data does not depend on the number of processes. Some Faker
+        data is built from sets, so `PYTHONHASHSEED` must be fixed as well to
+        reproduce a dataset in another run. Photos from external services are
+        not reproducible.
+
+        Args:
+            number: number of documents to generate
+            output_directory: directory where images are stored
+            workers: number of processes, defaults to the number of CPUs
+            renderer_factory: callable building the SVG renderer of each
+                process, as renderers can't be shared between processes.
+                Required when this generator has a renderer, which it must
+                build with the same configuration.
+            seed: seed of the dataset, None for unseeded generation
+
+        Returns:
+            list of output entries, for all sides of all generated documents
+
+        Raises:
+            ValueError: if this generator has a renderer but no renderer
+                factory is given
+        """
+        workers = workers or os.cpu_count() or 1
+        if renderer_factory is None and self.renderer is not None:
+            raise ValueError(
+                "A renderer factory is needed to build the renderer of each "
+                f"process, like the {type(self.renderer).__name__} renderer "
+                "of this generator."
+            )
+        chunksize = max(1, number // (workers * 4))
+        entries = []
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.template, renderer_factory, self.photo_url_request),
+        ) as executor:
+            for side_entries in executor.map(
+                _generate_worker,
+                itertools.repeat(output_directory, number),
+                document_seeds(seed, number),
+                chunksize=chunksize,
+            ):
+                entries.extend(side_entries)
         return entries
@@ -15,6 +15,111 @@ import typing as tp
 
 import numpy as np
 
+# Bound once, rather than looked up in the math module on each call
+_hypot = math.hypot
+_isnan = math.isnan
+_sqrt = math.sqrt
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, kernels then run as plain Python
+
+    def njit(*args, **kwargs):
+        def decorator(function):
+            return function
+
+        return decorator
+
+
+@njit(cache=True)
+def _guess_aspect_ratio_kernel(
+    x_1: float,
+    y_1: float,
+    x_2: float,
+    y_2: float,
+    x_3: float,
+    y_3: float,
+    x_4: float,
+    y_4: float,
+    img_width: float,
+    img_height: float,
+    epsilon: float,
+) -> float:
+    """Scalar computation of `Quadrangle.guess_aspect_ratio`.
+
+    Only floats are used, so that the kernel can be compiled by numba. Vectors
+    are (x, y, 1) in the paper, cross and dot products are developed.
+
+    Returns:
+        the aspect ratio, or NaN when it can't be computed
+    """
+    # Original image center
+    half_w = img_width / 2.0
+    half_h = img_height / 2.0
+
+    # Translate quadrangle points. The ordering of points 3 and 4 is not the
+    # same between our codebase and the paper, hence the inversion.
+    m1_x, m1_y = x_1 - half_w, y_1 - half_h
+    m2_x, m2_y = x_2 - half_w, y_2 - half_h
+    m3_x, m3_y = x_4 - half_w, y_4 - half_h
+    m4_x, m4_y = x_3 - half_w, y_3 - half_h
+
+    # (11) - (12), with cross(a, b) = (a_y - b_y, b_x - a_x, a_x b_y - a_y b_x)
+    cross_14_x, cross_14_y = m1_y - m4_y, m4_x - m1_x
+    cross_14_z = m1_x * m4_y - m1_y * m4_x
+    denominator_2 = (
+        (m2_y - m4_y) * m3_x + (m4_x - m2_x) * m3_y + (m2_x * m4_y - m2_y * m4_x)
+    )
+    denominator_3 = (
+        (m3_y - m4_y) * m2_x + (m4_x - m3_x) * m2_y + (m3_x * m4_y - m3_y * m4_x)
+    )
+    if denominator_2 == 0 or denominator_3 == 0:
+        return math.nan
+    coeff_2 = (cross_14_x * m3_x + cross_14_y * m3_y + cross_14_z) / denominator_2
+    coeff_3 = (cross_14_x * m2_x + cross_14_y * m2_y + cross_14_z) / denominator_3
+
+    # (14) - (16)
+    vec_2_x, vec_2_y = coeff_2 * m2_x - m1_x, coeff_2 * m2_y - m1_y
+    vec_3_x, vec_3_y = coeff_3 * m3_x - m1_x, coeff_3 * m3_y - m1_y
+    vec_2_z, vec_3_z = coeff_2 - 1.0, coeff_3 - 1.0
+    if (vec_2_z == 0) and (vec_3_z == 0):
+        # Parallelogram case, the aspect ratio can be derived directly
+        return _sqrt(
+            (vec_2_x * vec_2_x + vec_2_y * vec_2_y)
+            / (vec_3_x * vec_3_x + vec_3_y * vec_3_y)
+        )
+
+    if (abs(vec_2_z) < epsilon) or (abs(vec_3_z) < epsilon):
+        # At least two sides are almost parallel,
+        # so the computation of f is not reliable
+        width_1 = _hypot(x_1 - x_2, y_1 - y_2)
+        width_2 = _hypot(x_3 - x_4, y_3 - y_4)
+        height_1 = _hypot(x_1 - x_4, y_1 - y_4)
+        height_2 = _hypot(x_2 - x_3, y_2 - y_3)
+
+        if abs(vec_2_z) < epsilon:
+            # "Horizontal" sides are almost parallel
+            average_h = (height_1 + height_2) / 2.0
+            min_w = min(width_1, width_2)
+            max_w = max(width_1, width_2)
+            estimated_w = min_w + pow((min_w / max_w), 4) * (max_w - min_w)
+            return estimated_w / average_h
+
+        # "Vertical" sides are almost parallel
+        average_w = (width_1 + width_2) / 2.0
+        min_h = min(height_1, height_2)
+        max_h = max(height_1, height_2)
+        estimated_h = min_h + pow((min_h / max_h), 4) * (max_h - min_h)
+        return average_w / estimated_h
+
+    # General case
+    f_squared = abs(
+        (-1.0 / (vec_2_z * vec_3_z)) * (vec_2_x * vec_3_x + vec_2_y * vec_3_y)
+    )
+    vec_2_norm = vec_2_x * vec_2_x + vec_2_y * vec_2_y + vec_2_z * vec_2_z * f_squared
+    vec_3_norm = vec_3_x * vec_3_x + vec_3_y * vec_3_y + vec_3_z * vec_3_z * f_squared
+    return _sqrt(vec_2_norm / vec_3_norm)
+
 
 class Point(tp.NamedTuple):
     """Defines a point."""
@@ -35,7 +140,7 @@ class Point(tp.NamedTuple):
         Raises:
             RuntimeError: Dictionary doesn't have information to create a point
         """
-        return Point(*[float(input_dict[key]) for key in Point._fields])
+        return Point(float(input_dict["x"]), float(input_dict["y"]))
 
     def to_dict(self) -> tp.Dict[str, float]:
         """Export point to a dict.
@@ -43,7 +148,7 @@ class Point(tp.NamedTuple):
         Returns:
             dict containing point information
         """
-        return {key: getattr(self, key) for key in self._fields}
+        return {"x": self.x, "y": self.y}
 
     def distance(self, other_point: "Point") -> float:
         """Compute the distance between two points.
@@ -53,11 +158,20 @@ class Point(tp.NamedTuple):
 
         Returns:
             distance between two points
-
-        Raises:
-            RuntimeError: the two points have not the same dimension
         """
-        return math.sqrt(sum((px - qx) ** 2.0 for px, qx in zip(self, other_point)))
+        return _hypot(self.x - other_point.x, self.y - other_point.y)
+
+
+def _to_point(value: tp.Union[Point, tp.Dict[str, tp.Union[str, float]]]) -> Point:
+    """Get a point, either given as is or as a dict.
+
+    Args:
+        value: a point, or a dict containing point information
+
+    Returns:
+        the point
+    """
+    return value if isinstance(value, Point) else Point.from_dict(value)
 
 
 class Segment(tp.NamedTuple):
@@ -124,12 +238,10 @@ class Quadrangle(tp.NamedTuple):
             quadrangle
         """
         return Quadrangle(
-            *[
-                input_dict[key]
-                if isinstance(input_dict[key], Point)
-                else Point.from_dict(input_dict[key])
-                for key in Quadrangle._fields
-            ]
+            _to_point(input_dict["p1"]),
+            _to_point(input_dict["p2"]),
+            _to_point(input_dict["p3"]),
+            _to_point(input_dict["p4"]),
         )
 
     def to_dict(self) -> tp.Dict[str, tp.Dict[str, float]]:
@@ -138,7 +250,12 @@ class Quadrangle(tp.NamedTuple):
         Returns:
             dict containing quadrangle information
         """
-        return {key: getattr(self, key).to_dict() for key in self._fields}
+        return {
+            "p1": self.p1.to_dict(),
+            "p2": self.p2.to_dict(),
+            "p3": self.p3.to_dict(),
+            "p4": self.p4.to_dict(),
+        }
 
     def guess_aspect_ratio(
         self, img_width: float, img_height: float, epsilon=0.01
@@ -158,73 +275,20 @@ class Quadrangle(tp.NamedTuple):
         Returns:
             aspect ratio of the rectangle when the perspective is corrected
         """
-        # Original image center
-        half_w = img_width / 2.0
-        half_h = img_height / 2.0
-
-        # Translate quadrangle points and make 3-d vectors (x, y, 1)
-        # The ordering of points 3 and 4 is not the same between our codebase
-        # and the paper, hence the inversion.
-        point_1, point_2, point_4, point_3 = [
-            np.array([point.x - half_w, point.y - half_h, 1], dtype=float)
-            for point in self
-        ]
-
-        # (11) - (12)
-        coeff_2 = np.cross(point_1, point_4).dot(point_3) / np.cross(
-            point_2, point_4
-        ).dot(point_3)
-        coeff_3 = np.cross(point_1, point_4).dot(point_2) / np.cross(
-            point_3, point_4
-        ).dot(point_2)
-        if math.isinf(coeff_2) or math.isinf(coeff_3):
-            return None
-
-        # (14) - (16)
-        vec_2 = coeff_2 * point_2 - point_1
-        vec_3 = coeff_3 * point_3 - point_1
-        if (vec_2[2] == 0) and (vec_3[2] == 0):
-            # Parallelogram case, the aspect ratio can be derived directly
-            return math.sqrt(vec_2.dot(vec_2) / vec_3.dot(vec_3))
-
-        if (abs(vec_2[2]) < epsilon) or (abs(vec_3[2]) < epsilon):
-            # At least two sides are almost parallel,
-            # so the computation of f is not reliable
-            width_1 = self.p1.distance(self.p2)
-            width_2 = self.p3.distance(self.p4)
-            height_1 = self.p1.distance(self.p4)
-            height_2 = self.p2.distance(self.p3)
-
-            def estimate_parallel_sides_length(side1, side2):
-                min_s = min(side1, side2)
-                max_s = max(side1, side2)
-                return min_s + pow((min_s / max_s), 4) * (max_s - min_s)
-
-            return_value: float
-            if abs(vec_2[2]) < epsilon:
-                # "Horizontal" sides are almost parallel
-                average_h = (height_1 + height_2) / 2.0
-                estimated_w = estimate_parallel_sides_length(width_1, width_2)
-                return_value = estimated_w / average_h
-                return return_value
-
-            # "Vertical" sides are almost parallel
-            average_w = (width_1 + width_2) / 2.0
-            estimated_h = estimate_parallel_sides_length(height_1, height_2)
-            return_value = average_w / estimated_h
-            return return_value
-
-        # General case
-        f_squared = abs(
-            (-1.0 / (vec_2[2] * vec_3[2])) * (vec_2[0] * vec_3[0] + vec_2[1] * vec_3[1])
-        )
-        vec_2_norm = (
-            vec_2[0] * vec_2[0] + vec_2[1] * vec_2[1] + vec_2[2] * vec_2[2] * f_squared
+        ratio = _guess_aspect_ratio_kernel(
+            self.p1.x,
+            self.p1.y,
+            self.p2.x,
+            self.p2.y,
+            self.p3.x,
+            self.p3.y,
+            self.p4.x,
+            self.p4.y,
+            img_width,
+            img_height,
+            epsilon,
         )
-        vec_3_norm = (
-            vec_3[0] * vec_3[0] + vec_3[1] * vec_3[1] + vec_3[2] * vec_3[2] * f_squared
-        )
-        return math.sqrt(vec_2_norm / vec_3_norm)
+        return None if _isnan(ratio) else ratio
 
     def clip(
         self,
@@ -243,7 +307,7 @@ class Quadrangle(tp.NamedTuple):
         """
         return Quadrangle(
             *[
-                Point(np.clip(p.x, min_x, max_x), np.clip(p.y, min_y, max_y))
+                Point(min(max(p.x, min_x), max_x), min(max(p.y, min_y), max_y))
                 for p in self
             ]
         )
@@ -311,11 +375,23 @@ class Quadrangle(tp.NamedTuple):
         else:
             raise ValueError(f"The margins {margins} has unsupported type")
 
-        # Intermediate width used to compute temp quads
-        homography, target_height = estimate_homography_without_target(
-            self, max_x, max_y, target_width
+        # Parallelograms are mapped to rectangles by an affine transform,
+        # which is applied directly rather than estimated as a homography
+        (x_1, y_1), (x_2, y_2), (_, _), (x_4, y_4) = self
+        is_parallelogram = (
+            x_1 + self.p3.x == x_2 + x_4 and y_1 + self.p3.y == y_2 + y_4
         )
 
+        # Intermediate width used to compute temp quads
+        if is_parallelogram:
+            target_height = int(
+                target_width / self.guess_aspect_ratio(max_x, max_y)
+            )
+        else:
+            inverse_homography, target_height = estimate_homography_without_target(
+                self, max_x, max_y, target_width, return_inverse=True
+            )
+
         # Process relative margins
         margin_left = (
             margin_left * target_width
@@ -338,6 +414,23 @@ class Quadrangle(tp.NamedTuple):
             else margin_bottom
         )
 
+        if is_parallelogram:
+            # Coordinates relative to p1, along the p1-p2 and p1-p4 sides
+            left = -margin_left / target_width
+            right = 1.0 + margin_right / target_width
+            top = -margin_top / target_height
+            bottom = 1.0 + margin_bottom / target_height
+            corners = ((left, top), (right, top), (right, bottom), (left, bottom))
+            return Quadrangle(
+                *[
+                    Point(
+                        int(x_1 + u * (x_2 - x_1) + v * (x_4 - x_1)),
+                        int(y_1 + u * (y_2 - y_1) + v * (y_4 - y_1)),
+                    )
+                    for u, v in corners
+                ]
+            )
+
         # Create quad with margin
         quad = Quadrangle(
             Point(-margin_left, -margin_top),
@@ -345,7 +438,7 @@ class Quadrangle(tp.NamedTuple):
             Point(target_width + margin_right, target_height + margin_bottom),
             Point(-margin_left, target_height + margin_bottom),
         )
-        return project_quad_back_to_original_image(quad, homography, to_int=True)
+        return project_quad_to_target_image(quad, inverse_homography, to_int=True)
 
     def get_sides(self) -> tp.Tuple[Segment, Segment, Segment, Segment]:
         """Return the four sides of the perspective rectangle.
@@ -361,6 +454,20 @@ class Quadrangle(tp.NamedTuple):
             Segment(self.p4, self.p1),
         )
 
+    def _get_side_lengths(self) -> tp.Tuple[float, float, float, float]:
+        """Return the lengths of the four sides, in the order of `get_sides`.
+
+        Returns:
+            a tuple containing the lengths of the four sides
+        """
+        (x_1, y_1), (x_2, y_2), (x_3, y_3), (x_4, y_4) = self
+        return (
+            _hypot(x_1 - x_2, y_1 - y_2),
+            _hypot(x_2 - x_3, y_2 - y_3),
+            _hypot(x_3 - x_4, y_3 - y_4),
+            _hypot(x_4 - x_1, y_4 - y_1),
+        )
+
     def _get_corresponding_sides(self, length=True) -> tp.Tuple[Segment, Segment]:
         """Return a pair of corresponding sides.
 
@@ -372,9 +479,8 @@ class Quadrangle(tp.NamedTuple):
             a tuple containing a pair of corresponding sides
         """
         sides = self.get_sides()
-        if (sides[0].length + sides[2].length) > (
-            sides[1].length + sides[3].length
-        ):
+        lengths = self._get_side_lengths()
+        if (lengths[0] + lengths[2]) > (lengths[1] + lengths[3]):
             if length:
                 return (sides[0], sides[2])
             return (sides[1], sides[3])
@@ -404,8 +510,10 @@ class Quadrangle(tp.NamedTuple):
         Returns:
             an estimation of the length of the perspective rectangle
         """
-        sides = self.get_length_sides()
-        estimated_length: float = (sides[0].length + sides[1].length) / 2
+        lengths = self._get_side_lengths()
+        estimated_length: float = (
+            max(lengths[0] + lengths[2], lengths[1] + lengths[3]) / 2
+        )
         return estimated_length
 
     def estimate_width(self) -> float:
@@ -414,8 +522,10 @@ class Quadrangle(tp.NamedTuple):
         Returns:
             an estimation of the width of the perspective rectangle
         """
-        sides = self.get_width_sides()
-        estimated_width: float = (sides[0].length + sides[1].length) / 2
+        lengths = self._get_side_lengths()
+        estimated_width: float = (
+            min(lengths[0] + lengths[2], lengths[1] + lengths[3]) / 2
+        )
         return estimated_width
 
 
@@ -447,12 +557,8 @@ class BoundingBox(tp.NamedTuple):
             box
         """
         return BoundingBox(
-            *[
-                input_dict[key]
-                if isinstance(input_dict[key], Point)
-                else Point.from_dict(input_dict[key])
-                for key in BoundingBox._fields
-            ]
+            _to_point(input_dict["top_left"]),
+            _to_point(input_dict["bottom_right"]),
         )
 
     def to_dict(self) -> tp.Dict[str, tp.Dict[str, float]]:
@@ -461,7 +567,10 @@ class BoundingBox(tp.NamedTuple):
         Returns:
             dict containing quadrangle information
         """
-        return {key: getattr(self, key).to_dict() for key in self._fields}
+        return {
+            "top_left": self.top_left.to_dict(),
+            "bottom_right": self.bottom_right.to_dict(),
+        }
 
     @property
     def right(self) -> float:
@@ -532,9 +641,11 @@ class BoundingBox(tp.NamedTuple):
             min_x: minimum allowed x coordinate (default: 0)
             min_y: minimum allowed y coordinate (default: 0)
         """
-        top_left = Point(max(self.left, min_x), max(self.top, min_y))
-        bottom_right = Point(min(self.right, max_x), min(self.bottom, max_y))
-        return BoundingBox(top_left, bottom_right)
+        (left, top), (right, bottom) = self
+        return BoundingBox(
+            Point(max(left, min_x), max(top, min_y)),
+            Point(min(right, max_x), min(bottom, max_y)),
+        )
 
     def union(self, other_bbox: "BoundingBox") -> tp.Optional["BoundingBox"]:
         """Create a new BoundingBox formed by the union of two boxes.
@@ -552,13 +663,20 @@ class BoundingBox(tp.NamedTuple):
             the bounding box unioned from the current box and another one, or
             None when the union is empty
         """
-        left = min(self.left, other_bbox.left)
-        top = min(self.top, other_bbox.top)
-        right = max(self.right, other_bbox.right)
-        bottom = max(self.bottom, other_bbox.bottom)
-
-        union_bbox = BoundingBox(Point(left, top), Point(right, bottom))
-        return None if union_bbox.is_empty() else union_bbox
+        (left, top), (right, bottom) = self
+        if other_bbox == self:
+            return None if left >= right or top >= bottom else self
+
+        (other_left, other_top), (other_right, other_bottom) = other_bbox
+        left = min(left, other_left)
+        top = min(top, other_top)
+        right = max(right, other_right)
+        bottom = max(bottom, other_bottom)
+
+        # Check emptiness before allocating the union box
+        if left >= right or top >= bottom:
+            return None
+        return BoundingBox(Point(left, top), Point(right, bottom))
     
     def enlarge(
         self,
@@ -627,10 +745,9 @@ class BoundingBox(tp.NamedTuple):
         Returns:
             the smallest bounding box containing those 4 points
         """
-        return BoundingBox(
-            Point(min(pt[0] for pt in quad), min(pt[1] for pt in quad)),
-            Point(max(pt[0] for pt in quad), max(pt[1] for pt in quad)),
-        )
+        xs = (quad.p1.x, quad.p2.x, quad.p3.x, quad.p4.x)
+        ys = (quad.p1.y, quad.p2.y, quad.p3.y, quad.p4.y)
+        return BoundingBox(Point(min(xs), min(ys)), Point(max(xs), max(ys)))
 
     def to_quad(self) -> Quadrangle:
         """Create a quadrangle from bounding box.
@@ -656,7 +773,8 @@ def to_array(points: tp.Sequence[Point]) -> np.ndarray:
     Returns:
         array with points coordinates
     """
-    return np.array([[x, y] for x, y in points])
+    # Points iterate over their coordinates, giving a (n, 2) array directly
+    return np.asarray(points, dtype=np.float64)
 
 
 def estimate_doc_homography(
@@ -682,6 +800,13 @@ def estimate_doc_homography(
     np_source = to_array(source)
     np_target = to_array(target)
 
+    # With exactly 4 correspondences, the homography is the exact solution of
+    # a linear system, no need for the least-squares estimation
+    if len(np_source) == 4 and len(np_target) == 4:
+        return cv2.getPerspectiveTransform(
+            np_source.astype(np.float32), np_target.astype(np.float32)
+        )
+
     # Estimate homography. Using cv2.RANSAC algorithm could make it faster
     homography, _ = cv2.findHomography(np_source, np_target)
     return homography
@@ -692,6 +817,7 @@ def estimate_homography_without_target(
     image_width: float,
     image_height: float,
     target_width: float = 720,
+    return_inverse: bool = False,
 ):
     """Estimate homography without clear idea of output size.
 
@@ -702,10 +828,12 @@ def estimate_homography_without_target(
         image_width: width of original image in 
         image_height: height of original image to keep ratio
         target_width : target width (720 by default)
+        return_inverse: if True, estimate the inverse homography instead, to
+            project points back to the original image without inverting it
 
     Returns:
         Homography to transform the quadrangle to a quadrangle
-         of target_width, and the associated target height
+         of target_width (or the inverse one), and the associated target height
     """
     ratio = quad.guess_aspect_ratio(image_width, image_height)
     target_height = int(target_width / ratio)
@@ -716,8 +844,11 @@ def estimate_homography_without_target(
         Point(0, target_height),
     )
     # Computing transform
-    # Homography to transform corners to template
-    homography = estimate_doc_homography(quad, target_quad)
+    # Homography to transform corners to template, or template to corners
+    if return_inverse:
+        homography = estimate_doc_homography(target_quad, quad)
+    else:
+        homography = estimate_doc_homography(quad, target_quad)
     return homography, target_height
 
 
@@ -736,13 +867,60 @@ def project_quad_to_target_image(
     Returns:
         Quadrangle corresponding to the projection in the target image.
     """
-    np_points_bbox = np.float32([[[pt.x, pt.y] for pt in quadrangle]])
-    projected_bbox = cv2.perspectiveTransform(np_points_bbox, homography)[0]
+    return project_quads_to_target_image([quadrangle], homography, to_int)[0]
+
+
+def project_quads_to_target_image(
+    quadrangles: tp.Sequence[Quadrangle],
+    homography: np.ndarray,
+    to_int: bool = False,
+) -> tp.List[Quadrangle]:
+    """Project several quadrangles to the target image, in a single call.
+
+    Args:
+        quadrangles: quadrangles to project
+        homography: homography from original image to new image
+        to_int: if True, casts coordinates to integers, else leave them as floats
+
+    Returns:
+        Quadrangles corresponding to the projections in the target image.
+    """
+    if not quadrangles:
+        return []
+    np_points = np.asarray(quadrangles, dtype=np.float32).reshape(1, -1, 2)
+    projected_points = cv2.perspectiveTransform(np_points, homography)[0]
     if to_int:
-        pts_bbox = [Point(int(p[0]), int(p[1])) for p in projected_bbox]
-    else:
-        pts_bbox = [Point(*p) for p in projected_bbox]
-    return Quadrangle(*pts_bbox)
+        # Truncates toward zero, as int() does
+        projected_points = projected_points.astype(np.int32)
+    coordinates = projected_points.reshape(-1, 4, 2).tolist()
+    return [
+        Quadrangle(*[Point(x, y) for x, y in points]) for points in coordinates
+    ]
+
+
+def _invert_homography(homography: np.ndarray) -> np.ndarray:
+    """Invert a 3x3 homography using its adjugate matrix.
+
+    Cheaper than `np.linalg.inv` for such a small matrix.
+
+    Args:
+        homography: 3x3 invertible matrix
+
+    Returns:
+        the inverse of the homography
+    """
+    (a, b, c), (d, e, f), (g, h, i) = homography.tolist()
+    # Cofactors of the first column, reused by the determinant
+    cof_a = e * i - f * h
+    cof_d = c * h - b * i
+    cof_g = b * f - c * e
+    inv_det = 1.0 / (a * cof_a + d * cof_d + g * cof_g)
+    adjugate = (
+        (cof_a, cof_d, cof_g),
+        (f * g - d * i, a * i - c * g, c * d - a * f),
+        (d * h - e * g, b * g - a * h, a * e - b * d),
+    )
+    return np.array(adjugate) * inv_det
 
 
 def project_quad_back_to_original_image(
@@ -762,5 +940,5 @@ def project_quad_back_to_original_image(
         Quadrangle corresponding to the projection in the original image.
     """
     return project_quad_to_target_image(
-        quadrangle, np.linalg.inv(homography), to_int
+        quadrangle, _invert_homography(homography), to_int
     )
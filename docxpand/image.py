@@ -1,6 +1,6 @@
 """Provide a basic function to read images."""
 
-import base64
+import functools
 import os
 import typing as tp
 from enum import Enum
@@ -9,6 +9,18 @@ import cv2
 import math
 import numpy as np
 
+try:
+    # SIMD implementation of the base64 module, when available
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    # Pillow, or its pillow-simd fork, can be used to resize images
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
 from docxpand.geometry import BoundingBox
 
 SUPPORTED_IMAGE_FORMATS: tp.List[str] = [
@@ -20,6 +32,15 @@ SUPPORTED_IMAGE_FORMATS: tp.List[str] = [
 
 WHITE = (255, 255, 255)
 
+# Pillow resampling filters corresponding to OpenCV interpolation methods
+PIL_RESAMPLING_FILTERS = {
+    cv2.INTER_NEAREST: "NEAREST",
+    cv2.INTER_LINEAR: "BILINEAR",
+    cv2.INTER_CUBIC: "BICUBIC",
+    cv2.INTER_AREA: "BOX",
+    cv2.INTER_LANCZOS4: "LANCZOS",
+}
+
 
 class ColorSpace(Enum):
     """Enum for supported color spaces."""
@@ -60,6 +81,76 @@ class ColorSpace(Enum):
             ColorSpace.LAB,
         ]
 
+    def channels(self) -> int:
+        """Indicate the number of channels of images in the ColorSpace.
+
+        Returns:
+            4 for spaces with an alpha channel, 3 for other color spaces, and 1
+            for spaces without color.
+        """
+        if self.has_alpha():
+            return 4
+        if self.has_color():
+            return 3
+        return 1
+
+
+# OpenCV conversion codes between color spaces, when available
+_COLOR_CONVERSION_CODES: tp.Dict[tp.Tuple[ColorSpace, ColorSpace], int] = {
+    (source, target): getattr(cv2, f"COLOR_{source.value}2{target.value}")
+    for source in ColorSpace
+    for target in ColorSpace
+    if hasattr(cv2, f"COLOR_{source.value}2{target.value}")
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _compute_target_size(
+    source_height: int, source_width: int, height: int, width: int, max_side: int
+) -> tp.Tuple[int, int]:
+    """Compute the target size of `Image.resize`.
+
+    Results are cached, as images of the same size are often resized to the
+    same size.
+
+    Args:
+        source_height: height of the image to resize
+        source_width: width of the image to resize
+        height: target height, deduced automatically if <=0.
+        width: target width, deduced automatically if <=0.
+        max_side: maximum value for height or width, ignored if <=0.
+
+    Returns:
+        the target height and width
+
+    Raises:
+        ValueError: if no valid args are passed
+    """
+    if height > 0 and width <= 0:
+        width = math.ceil(
+            float(source_width) * (float(height) / float(source_height))
+        )
+    elif height <= 0 and width > 0:
+        height = math.ceil(
+            float(source_height) * (float(width) / float(source_width))
+        )
+    elif max_side > 0:
+        width, height = source_width, source_height
+    elif not (width > 0 and height > 0):
+        raise ValueError(
+            "A positive int value for at least one argument is needed"
+        )
+    if max_side > 0:
+        if height > max_side:
+            ratio = max_side / height
+            height = max_side
+            width = round(width * ratio)
+        if width > max_side:
+            ratio = max_side / width
+            width = max_side
+            height = round(ratio * height)
+    return height, width
+
 
 class Image:
     """Class representing an image loaded as a numpy array using OpenCV.
@@ -76,6 +167,8 @@ class Image:
         _space: the color space of the image
     """
 
+    __slots__ = ("_array", "_space")
+
     def __init__(self, array: np.ndarray, space: ColorSpace):
         """Initialize an Image object.
 
@@ -93,7 +186,7 @@ class Image:
         Returns:
             the height of the image
         """
-        return self.shape[0]
+        return self._array.shape[0]
 
     @property
     def width(self) -> int:
@@ -102,7 +195,7 @@ class Image:
         Returns:
             the width of the image
         """
-        return self.shape[1]
+        return self._array.shape[1]
 
     @property
     def channels(self) -> int:
@@ -111,9 +204,46 @@ class Image:
         Returns:
             the number of channels of the image
         """
-        if len(self.shape) <= 2:
+        shape = self._array.shape
+        if len(shape) <= 2:
             return 1
-        return self.shape[2]
+        return shape[2]
+
+    @property
+    def shape(self) -> tp.Tuple[int, ...]:
+        """Return the shape of the array representing the image.
+
+        Returns:
+            the shape of the array representing the image
+        """
+        return self._array.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Return the data type of the array representing the image.
+
+        Returns:
+            the data type of the array representing the image
+        """
+        return self._array.dtype
+
+    @property
+    def size(self) -> int:
+        """Return the number of elements of the array representing the image.
+
+        Returns:
+            the number of elements of the array representing the image
+        """
+        return self._array.size
+
+    @property
+    def nbytes(self) -> int:
+        """Return the number of bytes of the array representing the image.
+
+        Returns:
+            the number of bytes of the array representing the image
+        """
+        return self._array.nbytes
 
     @property
     def space(self) -> ColorSpace:
@@ -136,6 +266,7 @@ class Image:
     def convert_color(
         self,
         target_space: ColorSpace,
+        inplace: bool = False,
     ) -> "Image":
         """Converts the color space of the current image.
 
@@ -144,17 +275,89 @@ class Image:
 
         Args:
             target_space: target color space
+            inplace: if True, and if both color spaces have the same number of
+                channels, the conversion overwrites the current image array
+                (and any image sharing it) instead of allocating a new one
 
         Returns:
             a new image with the requested ColorSpace, or the same image when
-            target color space matches the current image color space
+            target color space matches the current image color space or when
+            the conversion is done in place
         """
         if target_space == self._space:
             return self
-        mode = f"COLOR_{self._space.value}2{target_space.value}"
-        converted_array = cv2.cvtColor(self._array, getattr(cv2, mode))
+        code = _COLOR_CONVERSION_CODES.get((self._space, target_space))
+        if code is None:
+            mode = f"COLOR_{self._space.value}2{target_space.value}"
+            raise AttributeError(f"module 'cv2' has no attribute '{mode}'")
+        if inplace and self._can_convert_inplace(target_space):
+            cv2.cvtColor(self._array, code, dst=self._array)
+            self._space = target_space
+            return self
+        converted_array = cv2.cvtColor(self._array, code)
         return Image(converted_array, target_space)
 
+    def _can_convert_inplace(self, target_space: ColorSpace) -> bool:
+        """Indicate whether the image array can store the converted image.
+
+        Args:
+            target_space: target color space
+
+        Returns:
+            True if the array is contiguous, writeable, and has the number of
+            channels of the target color space
+        """
+        flags = self._array.flags
+        return (
+            self.channels == target_space.channels()
+            and flags.c_contiguous
+            and flags.writeable
+        )
+
+    @staticmethod
+    def convert_color_batch(
+        images: tp.Sequence["Image"], target_space: ColorSpace
+    ) -> tp.List["Image"]:
+        """Converts the color space of several images.
+
+        When all images have the same color space, shape and data type, they are
+        converted into a single preallocated buffer, and the returned images are
+        views on it. Otherwise, they are converted one by one.
+
+        Args:
+            images: images to convert
+            target_space: target color space
+
+        Returns:
+            the images with the requested ColorSpace
+        """
+        if not images:
+            return []
+        first = images[0]
+        source_space = first.space
+        if source_space == target_space or any(
+            image.space != source_space
+            or image.shape != first.shape
+            or image.dtype != first.dtype
+            for image in images
+        ):
+            return [image.convert_color(target_space) for image in images]
+
+        code = _COLOR_CONVERSION_CODES.get((source_space, target_space))
+        if code is None:
+            mode = f"COLOR_{source_space.value}2{target_space.value}"
+            raise AttributeError(f"module 'cv2' has no attribute '{mode}'")
+        shape = (len(images), first.height, first.width)
+        if target_space.channels() > 1:
+            shape += (target_space.channels(),)
+        converted_arrays = np.empty(shape, dtype=first.dtype)
+        for image, converted_array in zip(images, converted_arrays):
+            cv2.cvtColor(image.array, code, dst=converted_array)
+        return [
+            Image(converted_array, target_space)
+            for converted_array in converted_arrays
+        ]
+
     def crop(self, bounding_box: BoundingBox) -> "Image":
         """Crop a bounding box from the image, and return the cropped image.
 
@@ -170,26 +373,28 @@ class Image:
         Raises:
             ValueError: if the bounding box is invalid
         """
-        bounding_box = bounding_box.clip(self.width, self.height)
+        height, width = self._array.shape[:2]
+        (left, top), (right, bottom) = bounding_box.clip(width, height)
+        # Cropping the whole image is a no-op
+        if left == 0 and top == 0 and right == width and bottom == height:
+            return self
 
         return Image(
             self._array[
-                int(round(bounding_box.top)) : int(round(bounding_box.bottom)),
-                int(round(bounding_box.left)) : int(round(bounding_box.right)),
+                int(round(top)) : int(round(bottom)),
+                int(round(left)) : int(round(right)),
                 ...,
             ],
             self._space,
         )
 
-    def __getattr__(self, item: str) -> tp.Any:
-        return getattr(self._array, item)
-
     def resize(
         self,
         height: int = 0,
         width: int = 0,
         max_side: int = 0,
         interpolation: int = cv2.INTER_AREA,
+        engine: str = "cv2",
     ) -> "Image":
         """Return a resized image.
 
@@ -201,36 +406,27 @@ class Image:
             max_side: maximum value for height or width, ignored if <=0.
             interpolation: specify the interpolation method to use.
                 (default to INTER_AREA method)
+            engine: library used to resize the image, "cv2" (default) or
+                "pil". Pillow, especially its pillow-simd fork, can be faster
+                for large downscales of 8-bit images; the interpolation method
+                is then mapped to the corresponding Pillow filter.
 
         Returns:
             the resized image, in a new Image object
         Raises:
-            ValueError: if no valid args are passed
+            ValueError: if no valid args are passed, or if the engine can't
+                resize this image with this interpolation method
+            ImportError: if the "pil" engine is requested without Pillow
         """
-        if height > 0 and width <= 0:
-            width = math.ceil(
-                float(self.width) * (float(height) / float(self.height))
-            )
-        elif height <= 0 and width > 0:
-            height = math.ceil(
-                float(self.height) * (float(width) / float(self.width))
-            )
-        elif max_side > 0:
-            width, height = self.width, self.height
-        elif not (width > 0 and height > 0):
-            raise ValueError(
-                "A positive int value for at least one argument is needed"
+        height, width = _compute_target_size(
+            self.height, self.width, height, width, max_side
+        )
+        if engine == "pil":
+            return Image(
+                self._resize_with_pil(width, height, interpolation), self.space
             )
-        if max_side > 0:
-            ratio = 1.0
-            if height > max_side:
-                ratio = max_side / height
-                height = max_side
-                width = round(width * ratio)
-            if width > max_side:
-                ratio = max_side / width
-                width = max_side
-                height = round(ratio * height)
+        if engine != "cv2":
+            raise ValueError(f"Unsupported resizing engine: {engine}")
         return Image(
             cv2.resize(
                 self.array, dsize=(width, height), interpolation=interpolation
@@ -238,27 +434,63 @@ class Image:
             self.space,
         )
 
-    def rotate90(self, angle: tp.Optional[int]) -> "Image":
+    def _resize_with_pil(
+        self, width: int, height: int, interpolation: int
+    ) -> np.ndarray:
+        """Resize the array of the image with Pillow.
+
+        Args:
+            width: target width
+            height: target height
+            interpolation: OpenCV interpolation method
+
+        Returns:
+            the resized array
+        """
+        if PILImage is None:
+            raise ImportError("Pillow is needed to resize images with PIL engine")
+        if self.dtype != np.uint8 or self.channels not in (1, 3, 4):
+            raise ValueError(
+                f"Cannot resize image with shape={self.shape} and "
+                f"dtype={self.dtype} using Pillow."
+            )
+        if interpolation not in PIL_RESAMPLING_FILTERS:
+            raise ValueError(
+                f"Unsupported interpolation for PIL engine: {interpolation}"
+            )
+        resample = getattr(PILImage, PIL_RESAMPLING_FILTERS[interpolation])
+        array = self._array
+        if array.ndim == 3 and array.shape[2] == 1:
+            array = array[:, :, 0]
+        resized = PILImage.fromarray(array).resize((width, height), resample)
+        # Copy, as arrays sharing Pillow memory are read-only. Like cv2.resize,
+        # single channel images are returned as 2D arrays
+        return np.array(resized)
+
+    def rotate90(self, angle: tp.Optional[int], copy: bool = True) -> "Image":
         """Rotate the image by multiples of 90° counter-clockwise.
 
         Args:
             angle: the rotation angle, which must be a multiple of 90°. If 0°
-                or None is given, a copy of the image is returned.
+                or None is given, the image is returned unrotated.
+            copy: if True, the rotated image has its own contiguous array. If
+                False, it is a view on the current image array, which avoids a
+                copy but is shared with this image: modifying one modifies the
+                other.
+
+        Returns:
+            the rotated image
         """
-        if angle is None or angle % 360 == 0:
-            return Image(self.array.copy(), self.space)
-        assert angle is not None
+        if angle is None:
+            angle = 0
         if angle % 90:
             raise ValueError(
                 f"The angle parameter must be a multiple of 90°, got {angle}."
             )
-        angle = angle % 360
-        angle_to_cv2_arg = {
-            90: cv2.ROTATE_90_COUNTERCLOCKWISE,
-            180: cv2.ROTATE_180,
-            270: cv2.ROTATE_90_CLOCKWISE,
-        }
-        return Image(cv2.rotate(self.array, angle_to_cv2_arg[angle]), self.space)
+        array = np.rot90(self._array, k=angle // 90 % 4)
+        if copy:
+            array = array.copy()
+        return Image(array, self._space)
 
     @staticmethod
     def guess_space(image: np.ndarray) -> ColorSpace:
@@ -325,13 +557,19 @@ class Image:
             params = []
         cv2.imwrite(filename, self.array, params)
 
-    def base64encode(self, format: str = "png") -> str:
+    def base64encode(
+        self, format: str = "png", params: tp.Optional[tp.List] = None
+    ) -> str:
         """Encode an image in base64 format.
 
         Args:
             format: image format (default is png)
+            params: format-specific parameters encoded as pairs, see `write`
         """
-        _, buffer = cv2.imencode(f".{format}", self.array)
+        if params is None:
+            params = []
+        _, buffer = cv2.imencode(f".{format}", self.array, params)
+        # The encoded array exposes its memory, it is not converted to bytes
         encoded = base64.b64encode(buffer)
         encoded_str = encoded.decode("ascii")
         mime = f"data:image/{format};base64"
@@ -344,15 +582,14 @@ class Image:
         Args:
             encoded_str: the base64 encoded image
         """
-        # _, buffer = cv2.imencode(f".{format}", self.array)
         _, encoded_image = encoded_str.split(",")
-        encoded_buffer = encoded_image.encode("ascii")
-        decoded_buffer = base64.b64decode(encoded_buffer)
+        # ASCII strings are decoded directly, without an intermediate bytes copy
+        decoded_buffer = base64.b64decode(encoded_image)
         return Image.from_buffer(decoded_buffer)
 
     @staticmethod
     def from_buffer(
-        buffer: bytes,
+        buffer: tp.Union[bytes, bytearray, memoryview],
         space: ColorSpace = ColorSpace.BGR,
         ignore_orientation: bool = True,
         background=WHITE,
@@ -361,6 +598,8 @@ class Image:
 
         Args:
             buffer: buffer containing image data. Must have a uint8 data type.
+                Any bytes-like object (bytes, bytearray, memoryview) is decoded
+                directly, without being copied first.
             space: target color space of the loaded image
             ignore_orientation: if True, ignores the orientation flag
                 in EXIF metadata; else it is used to rotate the image
@@ -380,7 +619,7 @@ class Image:
 
     @staticmethod
     def _decode(
-        data: tp.Union[str, bytes],
+        data: tp.Union[str, bytes, bytearray, memoryview],
         space: ColorSpace = ColorSpace.BGR,
         ignore_orientation: bool = True,
         background=WHITE,
@@ -388,7 +627,7 @@ class Image:
         """Load an image using OpenCV, from file or bytes; return Image object.
 
         Args:
-            data: filename or byte array to decode
+            data: filename, or buffer (bytes, bytearray, memoryview) to decode
             space: target color space of the loaded image
             ignore_orientation: if True, ignores the orientation flag
                 in EXIF metadata; else it is used to rotate the image
@@ -427,10 +666,11 @@ class Image:
 
         if ignore_orientation:
             flags = flags | cv2.IMREAD_IGNORE_ORIENTATION
-        if isinstance(data, bytes):
-            array: np.ndarray = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+        if isinstance(data, str):
+            array: np.ndarray = cv2.imread(data, flags)
         else:
-            array = cv2.imread(data, flags)
+            # Wrapping the buffer in an array does not copy it
+            array = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
 
         if array is None:
             raise RuntimeError("Image cannot be loaded by OpenCV")
@@ -438,7 +678,8 @@ class Image:
         guessed_space = Image.guess_space(array)
         image = Image(array, guessed_space)
         if guessed_space != space:
-            return image.convert_color(space)
+            # The decoded array is not shared, it can be overwritten
+            return image.convert_color(space, inplace=True)
 
         return image
 
@@ -1,9 +1,11 @@
 """Instantiable class definition."""
-import copy
+import functools
 import importlib
 import re
 import typing as tp
 
+_FORMATTABLE_PATTERN = re.compile("{.*}")
+
 
 def _is_string_formattable(value: str) -> bool:
     """Test if a string is formattable (i.e. contains {.*} pattern).
@@ -14,12 +16,75 @@ def _is_string_formattable(value: str) -> bool:
     Returns:
         True if it is formattable, else False
     """
-    return re.search("{.*}", value) is not None
+    return "{" in value and _FORMATTABLE_PATTERN.search(value) is not None
+
+
+def _copy_definition(definition: tp.Any) -> tp.Any:
+    """Copy the dictionaries and lists of a definition, recursively.
+
+    Other values are shared with the original definition. This is cheaper than
+    `copy.deepcopy`, and enough to protect definitions from modifications.
+
+    Args:
+        definition: the definition to copy
+
+    Returns:
+        the copied definition
+    """
+    if isinstance(definition, dict):
+        return {key: _copy_definition(value) for key, value in definition.items()}
+    if isinstance(definition, list):
+        return [_copy_definition(value) for value in definition]
+    return definition
+
+
+def _instantiate_or_copy(value: tp.Any, context: tp.Dict) -> tp.Any:
+    """Instantiate a value if possible, else copy its containers.
+
+    Args:
+        value: a value that may be an instantiable dictionary
+        context: the context
+
+    Returns:
+        the instantiated object, or a copy of the value
+    """
+    if Instantiable.is_instantiable(value):
+        return Instantiable.instantiate(value, **context)
+    return _copy_definition(value)
+
+
+def _resolve_arguments(arguments: tp.Dict, context: tp.Dict) -> tp.Dict:
+    """Format and instantiate configuration arguments using the context.
+
+    The arguments are left untouched, resolved values are stored in a new
+    dictionary.
+
+    Args:
+        arguments: the configuration arguments
+        context: the context
+
+    Returns:
+        the resolved arguments
+    """
+    resolved = {}
+    for key, value in arguments.items():
+        if isinstance(value, str):
+            if _is_string_formattable(value):
+                value = value.format_map(context)
+        elif isinstance(value, list):
+            value = [_instantiate_or_copy(element, context) for element in value]
+        else:
+            value = _instantiate_or_copy(value, context)
+        resolved[key] = value
+    return resolved
 
 
+@functools.lru_cache(maxsize=None)
 def import_object(full_name: str) -> tp.Any:
     """Dynamically import an object using its fully qualified name.
 
+    Resolved objects are cached by name.
+
     Args:
         full_name: fully qualified name of the object to import
 
@@ -74,23 +139,13 @@ class Instantiable:
         Returns:
             the fully instantiated object
         """
-        instantiable = copy.deepcopy(instantiable)
-
         # Initialize arguments
         arguments = instantiable.get("init_args", {})
         assert isinstance(arguments, dict)
 
         # Format configuration arguments using context and instantiate
         # sub-objects when applicable
-        for key, value in arguments.items():
-            if isinstance(value, str) and _is_string_formattable(value):
-                arguments[key] = value.format(**kwargs)
-            elif isinstance(value, list):
-                arguments[key] = [
-                    Instantiable.try_instantiate(element, **kwargs) for element in value
-                ]
-            else:
-                arguments[key] = Instantiable.try_instantiate(value, **kwargs)
+        arguments = _resolve_arguments(arguments, kwargs)
 
         # Add other arguments from context
         for key, value in instantiable.get("init_context", {}).items():
@@ -101,7 +156,7 @@ class Instantiable:
         the_class_str = instantiable.get("__class__")
         assert isinstance(the_class_str, str)
         if _is_string_formattable(the_class_str):
-            the_class_str = the_class_str.format(**kwargs)
+            the_class_str = the_class_str.format_map(kwargs)
         the_class = import_object(the_class_str)
 
         # Make instance
@@ -178,13 +233,13 @@ class CallableInstantiable(Instantiable):
             methods = {}
             for method_key, method_name in method_names.items():
                 if _is_string_formattable(method_name):
-                    method_name = method_name.format(**kwargs)
+                    method_name = method_name.format_map(kwargs)
                 method = getattr(instance, method_name)
                 methods[method_key] = method
         # Or a single method name
         elif isinstance(method_names, str):
             if _is_string_formattable(method_names):
-                method_names = method_names.format(**kwargs)
+                method_names = method_names.format_map(kwargs)
             methods = getattr(instance, method_names)
         else:
             raise ValueError(f"Unsupported __method__ argument: {method_names}")
@@ -211,8 +266,6 @@ class CallableInstantiable(Instantiable):
         Returns:
             the result of the method called on the instantiated object
         """
-        callable = copy.deepcopy(callable)
-
         # Get methods
         methods = CallableInstantiable.get_methods(callable, **kwargs)
         # Initialize arguments
@@ -220,15 +273,7 @@ class CallableInstantiable(Instantiable):
         assert isinstance(arguments, dict)
         # Format configuration arguments using context and instantiate
         # sub-objects when applicable
-        for key, value in arguments.items():
-            if isinstance(value, str) and _is_string_formattable(value):
-                arguments[key] = value.format(**kwargs)
-            elif isinstance(value, list):
-                arguments[key] = [
-                    Instantiable.try_instantiate(element, **kwargs) for element in value
-                ]
-            else:
-                arguments[key] = Instantiable.try_instantiate(value, **kwargs)
+        arguments = _resolve_arguments(arguments, kwargs)
 
         # Add other arguments from context
         for key, value in callable.get("call_context", {}).items():
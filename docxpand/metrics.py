@@ -1,11 +1,113 @@
+import typing as tp
+
 from rapidfuzz.distance import Levenshtein
 from shapely.geometry import Polygon
 
 from docxpand.geometry import Quadrangle
 
 
+Polygon2D = tp.List[tp.Tuple[float, float]]
+
+
+def _signed_area(polygon: Polygon2D) -> float:
+    """Compute the signed area of a polygon with the shoelace formula.
+
+    Args:
+        polygon: vertices of the polygon
+
+    Returns:
+        the area, positive if vertices are ordered counter-clockwise (in a
+        direct frame), negative otherwise
+    """
+    area = 0.0
+    previous_x, previous_y = polygon[-1]
+    for x, y in polygon:
+        area += previous_x * y - x * previous_y
+        previous_x, previous_y = x, y
+    return area / 2.0
+
+
+def _is_convex(polygon: Polygon2D) -> bool:
+    """Indicate whether a polygon is strictly convex.
+
+    Args:
+        polygon: vertices of the polygon
+
+    Returns:
+        True if all turns of the polygon are strictly in the same direction
+    """
+    signs = set()
+    for index, (x_2, y_2) in enumerate(polygon):
+        x_1, y_1 = polygon[index - 1]
+        x_3, y_3 = polygon[(index + 1) % len(polygon)]
+        cross = (x_2 - x_1) * (y_3 - y_2) - (y_2 - y_1) * (x_3 - x_2)
+        if cross == 0:
+            return False
+        signs.add(cross > 0)
+    return len(signs) == 1
+
+
+def _clip_convex(subject: Polygon2D, clip: Polygon2D) -> Polygon2D:
+    """Clip a polygon by a convex one (Sutherland-Hodgman algorithm).
+
+    Args:
+        subject: vertices of the polygon to clip
+        clip: vertices of the convex clipping polygon, counter-clockwise
+
+    Returns:
+        vertices of the intersection of the two polygons
+    """
+    output = subject
+    previous_clip_x, previous_clip_y = clip[-1]
+    for clip_x, clip_y in clip:
+        if not output:
+            break
+        edge_x = clip_x - previous_clip_x
+        edge_y = clip_y - previous_clip_y
+        vertices = output
+        output = []
+        previous_x, previous_y = vertices[-1]
+        previous_side = edge_x * (previous_y - previous_clip_y) - edge_y * (
+            previous_x - previous_clip_x
+        )
+        for x, y in vertices:
+            side = edge_x * (y - previous_clip_y) - edge_y * (x - previous_clip_x)
+            if (side >= 0) != (previous_side >= 0):
+                # The segment crosses the clipping edge, add the intersection
+                ratio = previous_side / (previous_side - side)
+                output.append(
+                    (
+                        previous_x + ratio * (x - previous_x),
+                        previous_y + ratio * (y - previous_y),
+                    )
+                )
+            if side >= 0:
+                output.append((x, y))
+            previous_x, previous_y, previous_side = x, y, side
+        previous_clip_x, previous_clip_y = clip_x, clip_y
+    return output
+
+
 def iou(quad_detected: Quadrangle, quad_ground_truth: Quadrangle):
     """Calculate iou between two quadrangles."""
+    detected = [(float(x), float(y)) for x, y in quad_detected]
+    ground_truth = [(float(x), float(y)) for x, y in quad_ground_truth]
+    # Convex quadrangles are clipped directly, Shapely handles other cases
+    if _is_convex(detected) and _is_convex(ground_truth):
+        area_detected = _signed_area(detected)
+        area_ground_truth = _signed_area(ground_truth)
+        if area_ground_truth < 0:
+            ground_truth.reverse()
+            area_ground_truth = -area_ground_truth
+        intersection = _clip_convex(detected, ground_truth)
+        area_intersection = (
+            abs(_signed_area(intersection)) if len(intersection) >= 3 else 0.0
+        )
+        area_union = abs(area_detected) + area_ground_truth - area_intersection
+        if area_union:
+            return area_intersection / area_union
+        return 0
+
     polygon_detected = Polygon(quad_detected)
     polygon_ground_truth = Polygon(quad_ground_truth)
     polygon_intersection = polygon_detected.intersection(
@@ -20,4 +122,6 @@ def iou(quad_detected: Quadrangle, quad_ground_truth: Quadrangle):
 
 def character_error_rate(prediction: str, ground_truth: str):
     """Calculate character error rate between two strings."""
+    if not ground_truth:
+        return 0.0 if not prediction else 1.0
     return Levenshtein.distance(prediction, ground_truth) / len(ground_truth)
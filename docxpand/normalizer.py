@@ -7,6 +7,10 @@ import unicodedata as ud
 
 LIGATURES = {"Æ": "AE", "Œ": "OE", "æ": "oe", "œ": "oe"}
 
+_LIGATURES_TABLE = str.maketrans(LIGATURES)
+_PUNCT_PATTERN = re.compile(rf"[{string.punctuation}]")
+_WHITESPACES_PATTERN = re.compile(rf"[{string.whitespace}]+")
+
 
 def rm_accents(value: str) -> str:
     """Remove accents.
@@ -29,7 +33,7 @@ def rm_punct(value: str) -> str:
     Returns:
         text without punctuation
     """
-    return re.sub(rf"[{string.punctuation}]", " ", value)
+    return _PUNCT_PATTERN.sub(" ", value)
 
 
 def collapse_whitespace(value: str) -> str:
@@ -41,7 +45,7 @@ def collapse_whitespace(value: str) -> str:
     Returns:
         text without multi spaces
     """
-    return re.sub(rf"[{string.whitespace}]+", " ", value).strip()
+    return _WHITESPACES_PATTERN.sub(" ", value).strip()
 
 
 def replace_ligatures(value: str) -> str:
@@ -53,10 +57,7 @@ def replace_ligatures(value: str) -> str:
     Returns:
         normalized text
     """
-    for ligature, replacement in LIGATURES.items():
-        if ligature in value:
-            value = value.replace(ligature, replacement)
-    return value
+    return value.translate(_LIGATURES_TABLE)
 
 
 def normalize(value: str, operations: tp.Optional[tp.List[tp.Callable]] = None) -> str:
@@ -81,14 +82,42 @@ def cut_and_pad_right(string: str, length: int, padding_string: str = "") -> str
     return padded.upper()
 
 
+class _NameTranslationTable(dict):
+    """Translation table applying `rm_accents` then `rm_punct` to characters.
+
+    Used with `str.translate`, it removes accents and replaces punctuation and
+    whitespaces by spaces in a single pass. The translation of each character
+    is computed the first time it is met, then cached.
+    """
+
+    _PUNCT_AND_WHITESPACE_TABLE = str.maketrans(
+        dict.fromkeys(
+            # The backslash is not matched by the character class of `rm_punct`
+            string.punctuation.replace("\\", "") + string.whitespace,
+            " ",
+        )
+    )
+
+    def __missing__(self, char_code: int) -> str:
+        translation = rm_accents(chr(char_code)).translate(
+            self._PUNCT_AND_WHITESPACE_TABLE
+        )
+        self[char_code] = translation
+        return translation
+
+
+_NAME_TRANSLATION_TABLE = _NameTranslationTable()
+
+
 def normalize_name(name: tp.Union[str, tp.List[str]], padding_string: str = "") -> tp.Union[str, tp.List[str]]:
     if isinstance(name, list):
         return [normalize_name(val, padding_string) for val in name]
+    # Same as normalizing with rm_accents, rm_punct, replace_ligatures and
+    # collapse_whitespace, but in a single pass. Ligatures are already removed
+    # by rm_accents, as they have no ASCII decomposition.
+    words = name.translate(_NAME_TRANSLATION_TABLE).split(" ")
     return (
-        normalize(
-            name,
-            [rm_accents, rm_punct, replace_ligatures, collapse_whitespace],
-        )
+        " ".join(word for word in words if word)
         .strip()
         .upper()
         .replace(" ", padding_string)
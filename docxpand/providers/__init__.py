@@ -1,17 +1,219 @@
+import functools
+import itertools
 import typing as tp
-from collections import OrderedDict
+from collections import ChainMap, OrderedDict
 import gettext
-import numpy as np
-import random
+import re
+import weakref
 
+import numpy as np
 from faker import Faker
+from faker.providers import BaseProvider
 import pycountry
 
+from docxpand.conditionals import StandardNormalPool
 from docxpand.instantiable import Instantiable
 from docxpand.utils import get_field_from_any_side
 
 GENERIC_FAKER = Faker()
 
+_FORMAT_TOKEN_PATTERN = re.compile(r"\{\{\s*(\w+)(:\s*\w+?)?\s*\}\}")
+"""Tokens of Faker formats, as matched by `faker.Generator.parse`."""
+
+MAX_PARSE_ATTEMPTS = 100
+"""Maximum number of values generated from a format by `parse_with_max_length`."""
+
+_BRACES_TABLE = str.maketrans({"|": "{", "&": "}"})
+"""Translation of the escaped braces of `FormatProvider.format` formatters."""
+
+_REGISTERED_PROVIDERS: "weakref.WeakKeyDictionary[tp.Any, tp.Set[type]]" = (
+    weakref.WeakKeyDictionary()
+)
+_CUSTOM_PROVIDER_FAKERS: "weakref.WeakKeyDictionary[tp.Any, tp.Dict[type, Faker]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_faker(locale: str) -> Faker:
+    """Get a Faker instance for a locale, built once and then reused.
+
+    The instance only holds the stock Faker providers: custom providers are
+    registered on their own instances, see `RegisteredProvider`.
+
+    Args:
+        locale: the locale of the Faker instance
+
+    Returns:
+        the Faker instance
+    """
+    return Faker(locale)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_country(alpha_2: str) -> tp.Any:
+    """Get a country from its ISO 3166 alpha-2 code, looked up once.
+
+    Args:
+        alpha_2: the ISO 3166 alpha-2 code of the country
+
+    Returns:
+        the pycountry country
+    """
+    return pycountry.countries.get(alpha_2=alpha_2)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_country_translations(locale: str) -> gettext.NullTranslations:
+    """Get the translations of country names in a locale, loaded once.
+
+    Args:
+        locale: the locale of the translations
+
+    Returns:
+        the translations
+    """
+    return gettext.translation(
+        "iso3166", pycountry.LOCALES_DIR, languages=[locale]
+    )
+
+
+def register_provider(provider: BaseProvider) -> None:
+    """Add a provider to its Faker generator, once per provider class.
+
+    Providers are instantiated each time a value is generated, while Faker
+    instances are reused: adding every provider instance would make the list
+    of providers of the generator grow indefinitely.
+
+    Args:
+        provider: the provider to add to its generator
+    """
+    registered = _REGISTERED_PROVIDERS.setdefault(provider.generator, set())
+    if type(provider) not in registered:
+        provider.generator.add_provider(provider)
+        registered.add(type(provider))
+
+
+def _get_custom_provider_faker(faker: tp.Any, provider_class: type) -> tp.Any:
+    """Get the Faker instance dedicated to a custom provider class.
+
+    Registering a custom provider replaces the methods of the stock providers
+    of its generator, so custom providers are not registered on the Faker
+    instances shared by all fields, but on a copy per provider class, built
+    once with the same locales and the same random generator.
+
+    Args:
+        faker: the Faker instance given to the provider
+        provider_class: the class of the custom provider
+
+    Returns:
+        the Faker instance dedicated to the provider class, or `faker` itself
+        if it is not a Faker instance (e.g. a bare `faker.Generator`)
+    """
+    if not isinstance(faker, Faker):
+        return faker
+    fakers = _CUSTOM_PROVIDER_FAKERS.setdefault(faker, {})
+    custom_faker = fakers.get(provider_class)
+    if custom_faker is None:
+        custom_faker = Faker(faker.locales)
+        custom_faker.random = faker.random
+        fakers[provider_class] = custom_faker
+    return custom_faker
+
+
+class RegisteredProvider:
+    """Mixin for Faker providers, registering them when they are created.
+
+    Provider methods parsing formats need the provider to be registered in its
+    generator, so that the tokens of the formats are resolved by the provider.
+    Registering at creation avoids checking it on each call. The provider is
+    registered on a Faker instance dedicated to its class, leaving the given
+    one untouched.
+    """
+
+    def __init__(self, generator: tp.Any) -> None:
+        super().__init__(  # type: ignore
+            _get_custom_provider_faker(generator, type(self))
+        )
+        register_provider(self)  # type: ignore
+
+
+@functools.lru_cache(maxsize=None)
+def _get_format_min_length(pattern: str) -> int:
+    """Get the length of the text of a Faker format, without its tokens.
+
+    Args:
+        pattern: the Faker format
+
+    Returns:
+        the minimum length of the values generated from this format
+    """
+    return len(_FORMAT_TOKEN_PATTERN.sub("", pattern))
+
+
+def parse_with_max_length(
+    provider: BaseProvider,
+    formats: "OrderedDict[str, float]",
+    max_length: tp.Optional[int] = None,
+) -> str:
+    """Pick a format and generate a value not longer than a maximum length.
+
+    Formats whose text alone is longer than the maximum length can never fit,
+    they are discarded before picking one. Values generated from the picked
+    format are generated again while they are too long, up to
+    `MAX_PARSE_ATTEMPTS` times; the format is then discarded and another one
+    is picked.
+
+    Args:
+        provider: the provider picking the format, whose generator is used
+        formats: the Faker formats, with their weights
+        max_length: the maximum length of the value (default is 255)
+
+    Raises:
+        ValueError: if no format produced a value fitting in the maximum length
+
+    Returns:
+        the generated value
+    """
+    if max_length is None:
+        max_length = 255
+    fitting_formats = OrderedDict(
+        (pattern, weight)
+        for pattern, weight in formats.items()
+        if _get_format_min_length(pattern) <= max_length
+    )
+    # Keep picking from the original formats when they all fit, as Faker caches
+    # their keys
+    if len(fitting_formats) == len(formats):
+        fitting_formats = formats
+    while fitting_formats:
+        pattern: str = provider.random_element(fitting_formats)
+        for _ in range(MAX_PARSE_ATTEMPTS):
+            value = provider.generator.parse(pattern)
+            if len(value) <= max_length:
+                return value
+        fitting_formats = OrderedDict(fitting_formats)
+        del fitting_formats[pattern]
+    raise ValueError(f"No format could fit in {max_length} characters.")
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_weighted_population(
+    weighted_choices: tp.Tuple[tp.Tuple[tp.Any, float], ...]
+) -> tp.Tuple[tp.Tuple[tp.Any, ...], tp.Tuple[float, ...]]:
+    """Get choices and their cumulative weights, computed once per content.
+
+    Args:
+        weighted_choices: the choices, with their weights
+
+    Returns:
+        the choices and their cumulative weights
+    """
+    return (
+        tuple(choice for choice, _ in weighted_choices),
+        tuple(itertools.accumulate(weight for _, weight in weighted_choices)),
+    )
+
 
 class ChoiceProvider:
     def __init__(self, choices: tp.Union[tp.Dict[str, float], tp.List[str]]) -> None:
@@ -22,14 +224,19 @@ class ChoiceProvider:
 
     @staticmethod
     def random_choice(choices: tp.Any) -> tp.Any:
-        if isinstance(choices, (list, tuple, set, OrderedDict)):
-            return GENERIC_FAKER.random_elements(
-                choices, length=1, use_weighting=True
-            )[0]
+        # Same draws as GENERIC_FAKER.random_elements(choices, length=1,
+        # use_weighting=True), without rebuilding the weights each time
         if isinstance(choices, dict):
-            return GENERIC_FAKER.random_elements(
-                OrderedDict(choices), length=1, use_weighting=True
+            population, cum_weights = _get_weighted_population(
+                tuple(choices.items())
+            )
+            return GENERIC_FAKER.random.choices(
+                population, cum_weights=cum_weights
             )[0]
+        if isinstance(choices, (list, tuple)):
+            return GENERIC_FAKER.random.choice(choices)
+        if isinstance(choices, set):
+            return GENERIC_FAKER.random.choice(tuple(choices))
         return choices
 
 
@@ -51,13 +258,12 @@ class FormatProvider:
         formatter: str,
         existing_fields: tp.Optional[tp.Dict] = None,
     ) -> tp.Any:
-        formatter = formatter.replace("|", "{").replace("&", "}")
+        formatter = formatter.translate(_BRACES_TABLE)
         if not existing_fields:
             raise ValueError
-        fields = {}
-        for v in existing_fields.values():
-            fields.update(v)
-        return formatter.format(**fields)
+        # Fields of the last sides take precedence, as with successive updates
+        fields = ChainMap(*reversed(existing_fields.values()))
+        return formatter.format_map(fields)
 
 
 class InitialsProvider:
@@ -89,42 +295,96 @@ class GenderProvider:
 
 
 class HeightProvider:
+    """Heights are drawn from a per-process pool of standard normal values.
+
+    When generating in several processes, each worker must call
+    `HeightProvider.seed` with its own seed, otherwise forked workers draw the
+    same values.
+    """
+
     # Source: https://ourworldindata.org/human-height
     stats = {
         "male": (178.4, 7.6),  # mean, std
         "female": (164.7, 7.1)  # mean, std
     }
+    _genders = tuple(stats)
+    _normal_pool = StandardNormalPool()
 
     @staticmethod
-    def height_in_centimeters(gender: str) -> str:
+    def seed(seed: tp.Optional[int] = None) -> None:
+        HeightProvider._normal_pool.seed(seed)
+
+    @staticmethod
+    def _height(gender: str) -> float:
         if gender == "nonbinary":
-            gender = random.choice(list(HeightProvider.stats.keys()))
-        
+            gender = GENERIC_FAKER.random.choice(HeightProvider._genders)
+
         mean, std = HeightProvider.stats[gender]
-        return "%d cm" % round(np.random.normal(mean, std))
+        return mean + std * HeightProvider._normal_pool.next()
+
+    @staticmethod
+    def _heights(genders: tp.Sequence[str]) -> np.ndarray:
+        choice = GENERIC_FAKER.random.choice
+        genders = [
+            choice(HeightProvider._genders) if gender == "nonbinary" else gender
+            for gender in genders
+        ]
+        means, stds = np.array(
+            [HeightProvider.stats[gender] for gender in genders], dtype=np.float64
+        ).reshape(-1, 2).T
+        return means + stds * HeightProvider._normal_pool.take(len(genders))
+
+    @staticmethod
+    def height_in_centimeters(gender: str) -> str:
+        return f"{round(HeightProvider._height(gender))} cm"
 
     @staticmethod
     def height_in_meters(gender: str) -> str:
-        if gender == "nonbinary":
-            gender = random.choice(list(HeightProvider.stats.keys()))
-        
-        mean, std = HeightProvider.stats[gender]
-        return "%.2f m" % (np.random.normal(mean, std) / 100)
+        return f"{HeightProvider._height(gender) / 100:.2f} m"
+
+    @staticmethod
+    def height_in_centimeters_batch(genders: tp.Sequence[str]) -> tp.List[str]:
+        """Generate heights in centimeters for several persons at once.
+
+        Args:
+            genders: the genders of the persons
+
+        Returns:
+            the heights, in the same format as `height_in_centimeters`
+        """
+        heights = np.round(HeightProvider._heights(genders)).astype(np.int64)
+        return [f"{height} cm" for height in heights.tolist()]
+
+    @staticmethod
+    def height_in_meters_batch(genders: tp.Sequence[str]) -> tp.List[str]:
+        """Generate heights in meters for several persons at once.
+
+        Args:
+            genders: the genders of the persons
+
+        Returns:
+            the heights, in the same format as `height_in_meters`
+        """
+        heights = HeightProvider._heights(genders) / 100
+        return [f"{height:.2f} m" for height in heights.tolist()]
 
 
 class NationalityProvider:
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def nationality_from_locale(locale: str) -> str:
-        country = pycountry.countries.get(alpha_2=locale.split("_")[1])
+        country = _get_country(locale.split("_")[1])
         return country.alpha_3
 
 
 class ResidencePermitBirthPlaceProvider:
     @staticmethod
-    def birth_city(
-        locale: str, name_locale: str
-    ) -> str:
-        address_provider = Instantiable.instantiate(
+    @functools.lru_cache(maxsize=None)
+    def _get_address_provider(name_locale: str) -> BaseProvider:
+        # Built on its own Faker instance, like the stock provider built on a
+        # fresh Faker per call it replaces: the state of the Faker instances
+        # shared by fields must not change the generated cities
+        return Instantiable.instantiate(
             {
                 "__class__": f"faker.providers.address.{name_locale}.Provider",
                 "init_args": {
@@ -132,17 +392,21 @@ class ResidencePermitBirthPlaceProvider:
                 }
             }
         )
+
+    @staticmethod
+    def birth_city(
+        locale: str, name_locale: str
+    ) -> str:
+        address_provider = ResidencePermitBirthPlaceProvider._get_address_provider(
+            name_locale
+        )
         return address_provider.city()
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def birth_country(
         locale: str, name_locale: str
     ) -> str:
         country_code = name_locale.split("_")[1]
-        country = pycountry.countries.get(alpha_2=country_code)
-
-        translator = gettext.translation(
-            "iso3166", pycountry.LOCALES_DIR, languages=[locale]
-        )
-        translator.install()
-        return translator.gettext(country.name)
\ No newline at end of file
+        country = _get_country(country_code)
+        return _get_country_translations(locale).gettext(country.name)
\ No newline at end of file
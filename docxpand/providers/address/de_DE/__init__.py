@@ -3,8 +3,10 @@ from collections import OrderedDict
 
 from faker.providers.address.de_DE import Provider as AddressProvider
 
+from docxpand.providers import RegisteredProvider
 
-class Provider(AddressProvider):
+
+class Provider(RegisteredProvider, AddressProvider):
     __use_weighting__ = True
 
     city_formats = (
@@ -21513,8 +21515,6 @@ class Provider(AddressProvider):
         return self.random_element(self.city_suffixes)
 
     def city(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.city_formats)
         return self.generator.parse(pattern).title()
 
@@ -21530,25 +21530,17 @@ class Provider(AddressProvider):
         return self.random_element(self.building_number_extensions)
 
     def building_number(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.building_number_formats)
         return self.numerify(self.generator.parse(pattern))
 
     def building_name(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.building_name_formats)
         return self.generator.parse(pattern)
 
     def street_address(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.street_address_formats)
         return self.generator.parse(pattern)
 
     def address(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.address_formats)
         return self.generator.parse(pattern)
@@ -1,11 +1,36 @@
-import random
+import functools
+import itertools
+import re
 import typing as tp
 from collections import OrderedDict
 
 from faker.providers.address.fr_FR import Provider as AddressProvider
 
+from docxpand.providers import RegisteredProvider
 
-class Provider(AddressProvider):
+_BUILDING_NUMBER_FORMAT_PATTERN = re.compile(
+    r"(#+)( \{\{building_number_extension\}\})?"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_building_number_shape(pattern: str) -> tp.Optional[tp.Tuple[int, bool]]:
+    """Get the number of digits of a building number format, and its extension.
+
+    Args:
+        pattern: the building number format
+
+    Returns:
+        the number of digits and whether an extension follows them, or None if
+        the format is not made of digits optionally followed by an extension
+    """
+    match = _BUILDING_NUMBER_FORMAT_PATTERN.fullmatch(pattern)
+    if match is None:
+        return None
+    return len(match.group(1)), match.group(2) is not None
+
+
+class Provider(RegisteredProvider, AddressProvider):
     __use_weighting__ = True
 
     city_suffixes = (
@@ -116,13 +141,26 @@ class Provider(AddressProvider):
         )
     )
 
+    department_numbers = tuple(
+        str(number).zfill(2)
+        for number in itertools.chain(range(1, 96), range(971, 990))
+    )
+
     def department_number(self) -> str:
-        choices = list(range(1, 96)) + list(range(971, 990))
-        return str(random.choice(choices)).zfill(2)
+        return self.generator.random.choice(self.department_numbers)
+
+    def department_number_batch(self, count: int) -> tp.List[str]:
+        """Draw several department numbers at once.
+
+        Args:
+            count: the number of department numbers to draw
+
+        Returns:
+            the department numbers
+        """
+        return self.generator.random.choices(self.department_numbers, k=count)
 
     def place_of_birth(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.place_of_birth_format)
         return self.generator.parse(pattern)
 
@@ -130,25 +168,24 @@ class Provider(AddressProvider):
         return self.random_element(self.building_number_extensions)
     
     def building_number(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.building_number_formats)
-        return self.numerify(self.generator.parse(pattern))
+        shape = _get_building_number_shape(pattern)
+        if shape is None:
+            return self.numerify(self.generator.parse(pattern))
+        digits, has_extension = shape
+        number = str(self.generator.random.randrange(10**digits)).zfill(digits)
+        if has_extension:
+            return f"{number} {self.building_number_extension()}"
+        return number
     
     def building_name(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.building_name_formats)
         return self.generator.parse(pattern)
     
     def street_address(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.street_address_formats)
         return self.generator.parse(pattern)
 
     def address(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.address_formats)
         return self.generator.parse(pattern)
@@ -3,8 +3,10 @@ import typing as tp
 
 from faker.providers.address.nl_NL import Provider as AddressProvider
 
+from docxpand.providers import RegisteredProvider
 
-class Provider(AddressProvider):
+
+class Provider(RegisteredProvider, AddressProvider):
     __use_weighting__ = True
 
     city_formats = OrderedDict(
@@ -113,8 +115,6 @@ class Provider(AddressProvider):
         return self.random_element(self.city_prefixes)
 
     def city_name(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.city_formats)
         return self.generator.parse(pattern).title()
 
@@ -129,32 +129,22 @@ class Provider(AddressProvider):
         return self.random_element(self.building_number_extensions)
 
     def building_number(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.building_number_formats)
         return self.numerify(self.generator.parse(pattern))
 
     def building_name(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.building_name_formats)
         return self.generator.parse(pattern)
 
     def street_address(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.street_address_formats)
         return self.generator.parse(pattern)
 
     def address(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.address_formats)
         return self.generator.parse(pattern)
 
     def place_of_birth(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.place_of_birth_format)
         return self.generator.parse(pattern)
 
@@ -3,8 +3,10 @@ import typing as tp
 
 from faker.providers.address.pt_PT import Provider as AddressProvider
 
+from docxpand.providers import RegisteredProvider
 
-class Provider(AddressProvider):
+
+class Provider(RegisteredProvider, AddressProvider):
     __use_weighting__ = True
 
     city_formats = OrderedDict(
@@ -56,15 +58,11 @@ class Provider(AddressProvider):
         return self.random_element(self.city_prefixes)
 
     def city_name(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.city_formats)
         return self.generator.parse(pattern)
 
     city = city_name
 
     def place_of_birth(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.place_of_birth_format)
         return self.generator.parse(pattern)
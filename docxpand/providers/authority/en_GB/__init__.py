@@ -3,7 +3,9 @@ import typing as tp
 
 from faker.providers.address.en_GB import Provider as AddressProvider
 
-class Provider(AddressProvider):
+from docxpand.providers import RegisteredProvider, parse_with_max_length
+
+class Provider(RegisteredProvider, AddressProvider):
     __use_weighting__ = True
 
     authority_format = OrderedDict(
@@ -22,12 +24,4 @@ class Provider(AddressProvider):
         self,
         max_length: tp.Optional[int] = None,
     ) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
-        pattern: str = self.random_element(self.authority_format)
-        value = self.generator.parse(pattern)
-        if max_length is None:
-            max_length = 255
-        while len(value) > max_length:
-            value = self.generator.parse(pattern)
-        return value
+        return parse_with_max_length(self, self.authority_format, max_length)
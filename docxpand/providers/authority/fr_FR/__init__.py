@@ -1,7 +1,7 @@
 import typing as tp
-import random
 from collections import OrderedDict
 
+from docxpand.providers import parse_with_max_length
 from docxpand.providers.address.fr_FR import Provider as AddressProvider
 
 class Provider(AddressProvider):
@@ -16,22 +16,8 @@ class Provider(AddressProvider):
         )
     )
 
-    def department_number(self) -> str:
-        choices = list(range(1, 96)) + list(range(971, 990))
-        return str(random.choice(choices)).zfill(2)
-
     def authority(
         self,
         max_length: tp.Optional[int] = None,
     ):
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
-        pattern: str = self.random_element(self.authority_format)
-
-        value = self.generator.parse(pattern)
-        if max_length is None:
-            max_length = 255
-        while len(value) > max_length:
-            value = self.generator.parse(pattern)
-        
-        return value
+        return parse_with_max_length(self, self.authority_format, max_length)
@@ -1,6 +1,7 @@
 import typing as tp
 from collections import OrderedDict
 
+from docxpand.providers import parse_with_max_length
 from docxpand.providers.address.pt_PT import Provider as AddressProvider
 
 class Provider(AddressProvider):
@@ -18,14 +19,4 @@ class Provider(AddressProvider):
         self,
         max_length: tp.Optional[int] = None,
     ):
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
-        pattern: str = self.random_element(self.authority_format)
-
-        value = self.generator.parse(pattern)
-        if max_length is None:
-            max_length = 255
-        while len(value) > max_length:
-            value = self.generator.parse(pattern)
-        
-        return value
+        return parse_with_max_length(self, self.authority_format, max_length)
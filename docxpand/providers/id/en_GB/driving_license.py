@@ -1,4 +1,3 @@
-import random
 import typing as tp
 from datetime import datetime
 
@@ -14,6 +13,7 @@ from docxpand.normalizer import (
     rm_accents,
     rm_punct,
 )
+from docxpand.providers import GENERIC_FAKER
 from docxpand.utils import get_field_from_any_side
 
 # Settings for dateparser
@@ -63,7 +63,7 @@ class Provider:
         )
 
         # Make fake checksum
-        checksum = f"{random.randint(0, 99):02d}"
+        checksum = f"{GENERIC_FAKER.random.randint(0, 99):02d}"
 
         return f"{full_name[:5]}{document_number}  {checksum}"
 
@@ -77,7 +77,7 @@ class Provider:
 
         allowed_categories = []
         for category, probability in probabilities.items():
-            if random.random() <= probability:
+            if GENERIC_FAKER.random.random() <= probability:
                 allowed_categories.append(category)
 
         return "/".join(allowed_categories)
@@ -233,7 +233,7 @@ class Provider:
 
         restrictions = []
         for retriction, probability in probabilities.items():
-            if random.random() <= probability:
+            if GENERIC_FAKER.random.random() <= probability:
                 restrictions.append(retriction)
 
         return ",".join(restrictions[:max_restrictions])
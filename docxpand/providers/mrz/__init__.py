@@ -1,3 +1,4 @@
+import itertools
 import typing as tp
 
 import dateparser
@@ -8,6 +9,14 @@ from docxpand.normalizer import (
 )
 from docxpand.utils import get_field_from_any_side
 
+# Values of usual MRZ characters in checksums, other characters are computed
+CHECKSUM_VALUES = {
+    "<": 0,
+    **{str(digit): digit for digit in range(10)},
+    **{letter: ord(letter) - 55 for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"},
+}
+CHECKSUM_WEIGHTS = (7, 3, 1)
+
 
 class Provider:
     filler: str = "<"
@@ -26,15 +35,10 @@ class Provider:
             checksum value for string s
         """
         checker = 0
-        weights = [7, 3, 1]
-        for position, char in enumerate(string):
-            weight = weights[position % 3]
-            if char == "<":
-                val = 0
-            elif char.isdigit():
-                val = int(char)
-            else:
-                val = ord(char) - 55
+        for char, weight in zip(string, itertools.cycle(CHECKSUM_WEIGHTS)):
+            val = CHECKSUM_VALUES.get(char)
+            if val is None:
+                val = int(char) if char.isdigit() else ord(char) - 55
             checker += val * weight
         return str(checker % 10)
 
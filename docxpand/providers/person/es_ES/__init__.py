@@ -2,8 +2,10 @@ from collections import OrderedDict
 
 from faker.providers.person.es_ES import Provider as PersonProvider
 
+from docxpand.providers import RegisteredProvider
 
-class Provider(PersonProvider):
+
+class Provider(RegisteredProvider, PersonProvider):
     __use_weighting__ = True
 
     parents_names_format = OrderedDict(
@@ -16,7 +18,5 @@ class Provider(PersonProvider):
     )
 
     def parents_names(self) -> str:
-        if self not in self.generator.providers:
-            self.generator.add_provider(self)
         pattern: str = self.random_element(self.parents_names_format)
         return self.generator.parse(pattern)
@@ -1,4 +1,3 @@
-import base64
 import json
 import os
 import random
@@ -12,6 +11,11 @@ import numpy as np
 from dateutil.relativedelta import relativedelta
 from deepface import DeepFace
 
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 from docxpand.geometry import BoundingBox, Point
 from docxpand.image import ColorSpace, Image
 from docxpand.providers.photo.halftone import halftone
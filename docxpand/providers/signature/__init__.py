@@ -5,6 +5,8 @@ from collections import OrderedDict
 from docxpand.providers import ChoiceProvider
 from docxpand.utils import get_field_from_any_side
 
+_PARENTHESES_PATTERN = re.compile(r"[\(\[].*?[\)\]]")
+
 
 class Provider:
     signature_formats = OrderedDict(
@@ -62,7 +64,7 @@ class Provider:
             if prefix in field:
                 field = field.replace(prefix, "")
                 # Remove departement number from: {city} ({department_number})
-                field = re.sub("[\(\[].*?[\)\]]", "", field).strip()
+                field = _PARENTHESES_PATTERN.sub("", field).strip()
                 break
 
         if not field:
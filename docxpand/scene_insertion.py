@@ -1,4 +1,3 @@
-import datetime
 import getpass
 import logging
 import os
@@ -18,7 +17,7 @@ from docxpand.geometry import (
 from docxpand.image import ColorSpace, Image, load_document
 from docxpand.specimen import load_specimen
 from docxpand.svg_to_image import SVGRenderer
-from docxpand.utils import guess_mimetype
+from docxpand.utils import guess_mimetype, iso_utc_now
 
 
 logger = logging.getLogger(__name__)
@@ -266,9 +265,10 @@ def insert_image_in_background(
     )
     alpha = Image(alpha, ColorSpace.GRAYSCALE).convert_color(ColorSpace.BGR).array
     # Convert everything to float
-    alpha_array = alpha.astype(float) / 255
-    foreground_array = foreground.astype(float)
-    background_array = background.astype(float)
+    alpha_array = alpha.astype(np.float64)
+    alpha_array /= 255
+    foreground_array = foreground.array.astype(np.float64)
+    background_array = background.array.astype(np.float64)
 
     # Multiply the foreground with the alpha matte
     foreground_array = cv2.multiply(alpha_array, foreground_array)
@@ -522,7 +522,7 @@ def insert_generated_documents_in_scenes(
                         del annotation["fields"][side]
             annotation["scene_image"] = scene_id
             annotation["updated_at"] = (
-                datetime.datetime.utcnow().isoformat()
+                iso_utc_now()
             )
             inserted_documents.append(doc_entry)
 
@@ -539,7 +539,7 @@ def insert_generated_documents_in_scenes(
             "documents": inserted_documents,
             "info": {
                 "author": getpass.getuser(),
-                "createdAt": datetime.datetime.utcnow().isoformat(),
+                "createdAt": iso_utc_now(),
                 "description": (
                     f"Generated document images from document dataset "
                     f"{document_dataset_filename} and scene dataset "
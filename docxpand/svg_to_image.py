@@ -96,6 +96,47 @@ class SVGRenderer:
         filecontent = self.check_arguments_and_load_content(filename, filecontent)
         return self._render_image_from_content(filecontent, width)
 
+    def render_many(
+        self,
+        filecontents: tp.List[bytes],
+        width: int = 1000,
+    ) -> tp.List[Image]:
+        """Render several SVGs to Images.
+
+        Renderers able to process several SVGs at once override
+        `_render_images_from_contents`, by default SVGs are rendered one by one.
+
+        Args:
+            filecontents: contents of SVG files.
+            width : width of the images to get. Heights will be calculated from
+                width by respecting the aspect ratios.
+
+        Returns:
+            rendered Images, in the same order as the contents
+        """
+        filecontents = [
+            self.check_arguments_and_load_content(filecontent=filecontent)
+            for filecontent in filecontents
+        ]
+        return self._render_images_from_contents(filecontents, width)
+
+    def _render_images_from_contents(
+        self, filecontents: tp.List[bytes], width: int
+    ) -> tp.List[Image]:
+        """Perform the rendering of several SVGs.
+
+        Args:
+            filecontents: contents of SVG files.
+            width : width of the images to get.
+
+        Returns:
+            rendered Images, in the same order as the contents
+        """
+        return [
+            self._render_image_from_content(filecontent, width)
+            for filecontent in filecontents
+        ]
+
     def _render_image_from_content(self, filecontent: bytes, width: int):
         """Perform the rendering.
 
@@ -366,26 +407,46 @@ class RSVGRenderer(SVGRenderer):
             filecontent: content of SVG file.
             width : width of the image to get.
         """
-        with tempfile.TemporaryDirectory() as tmp_dirname:
-            svg_file_name = os.path.join(tmp_dirname, SVG_FILENAME)
-            with open(svg_file_name, mode="wb") as svg_file:
-                svg_file.write(filecontent)
+        return self._render_images_from_contents([filecontent], width)[0]
+
+    def _render_images_from_contents(
+        self, filecontents: tp.List[bytes], width: int
+    ) -> tp.List[Image]:
+        """Perform the rendering of several SVGs, in concurrent processes.
 
-            png_file_name = os.path.join(tmp_dirname, PNG_FILENAME)
-            command = [
-                RSVG_CONVERT_EXECUTABLE,
-                "-w",
-                str(width),
-                svg_file_name,
-                "-o",
-                png_file_name,
-            ]
-            completed_process = subprocess.run(command)
-            if completed_process.returncode:
-                raise RuntimeError(
-                    f"{RSVG_CONVERT_EXECUTABLE} failed with code "
-                    f"{completed_process.returncode} on file {svg_file_name} "
-                    f"(command: {command})."
+        Args:
+            filecontents: contents of SVG files.
+            width : width of the images to get.
+
+        Returns:
+            rendered Images, in the same order as the contents
+        """
+        with tempfile.TemporaryDirectory() as tmp_dirname:
+            commands = []
+            for index, filecontent in enumerate(filecontents):
+                svg_file_name = os.path.join(tmp_dirname, f"{index}-{SVG_FILENAME}")
+                with open(svg_file_name, mode="wb") as svg_file:
+                    svg_file.write(filecontent)
+                png_file_name = os.path.join(tmp_dirname, f"{index}-{PNG_FILENAME}")
+                commands.append(
+                    [
+                        RSVG_CONVERT_EXECUTABLE,
+                        "-w",
+                        str(width),
+                        svg_file_name,
+                        "-o",
+                        png_file_name,
+                    ]
                 )
 
-            return Image.read(png_file_name, ColorSpace.BGRA)
+            processes = [subprocess.Popen(command) for command in commands]
+            return_codes = [process.wait() for process in processes]
+            for command, return_code in zip(commands, return_codes):
+                if return_code:
+                    raise RuntimeError(
+                        f"{RSVG_CONVERT_EXECUTABLE} failed with code "
+                        f"{return_code} on file {command[3]} "
+                        f"(command: {command})."
+                    )
+
+            return [Image.read(command[-1], ColorSpace.BGRA) for command in commands]
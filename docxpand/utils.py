@@ -1,4 +1,5 @@
 import os
+import time
 import magic
 import typing as tp
 
@@ -105,3 +106,21 @@ def floor_to_multiple(number: float, base: int) -> int:
             "floor_to_multiple not implemented for negative numbers"
         )
     return int(number / base) * base
+
+
+def iso_utc_now() -> str:
+    """Get the current UTC date and time, in ISO 8601 format.
+
+    The string is built from integers rather than through datetime formatting,
+    which is comparatively slow. Unlike `datetime.isoformat`, microseconds are
+    always present.
+
+    Returns:
+        the current UTC date and time (e.g.: '2023-06-21T09:17:45.123456')
+    """
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    year, month, day, hour, minute, second = time.gmtime(seconds)[:6]
+    return (
+        f"{year:04d}-{month:02d}-{day:02d}T"
+        f"{hour:02d}:{minute:02d}:{second:02d}.{nanoseconds // 1000:06d}"
+    )
@@ -1,5 +1,4 @@
 """Script to delete fields from other side."""
-import datetime
 import getpass
 import logging
 import os
@@ -8,6 +7,7 @@ import click
 import tqdm
 
 from docxpand.dataset import DocFakerDataset
+from docxpand.utils import iso_utc_now
 
 
 logger = logging.getLogger(__name__)
@@ -52,7 +52,7 @@ def delete_other_side_fields(
         "documents": documents,
         "info": {
             "author": getpass.getuser(),
-            "createdAt": datetime.datetime.utcnow().isoformat(),
+            "createdAt": iso_utc_now(),
             "description": input_dataset.info().get("description"),
             "name": input_dataset.info().get("name")
         }
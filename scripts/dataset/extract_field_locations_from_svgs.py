@@ -1,5 +1,4 @@
 """Script to extract field locations from SVGs."""
-import datetime
 import getpass
 import logging
 import os
@@ -9,7 +8,7 @@ import tqdm
 
 from docxpand.dataset import DocFakerDataset
 from docxpand.svg_to_image import ChromeSVGRenderer
-from docxpand.utils import guess_mimetype
+from docxpand.utils import guess_mimetype, iso_utc_now
 
 
 logger = logging.getLogger(__name__)
@@ -92,7 +91,7 @@ def extract_fields_locations_from_svgs(
         "documents": documents,
         "info": {
             "author": getpass.getuser(),
-            "createdAt": datetime.datetime.utcnow().isoformat(),
+            "createdAt": iso_utc_now(),
             "description": input_dataset.info().get("description"),
             "name": input_dataset.info().get("name")
         }
@@ -1,5 +1,4 @@
 """Script to extract image fields (photo, datamatrix, barcodes) from SVGs."""
-import datetime
 import getpass
 import logging
 import os
@@ -7,10 +6,10 @@ import os
 import click
 import tqdm
 
-from docxpand.canvas import Canvas, XLINK_NS
+from docxpand.canvas import Canvas, XLINK_HREF
 from docxpand.dataset import DocFakerDataset
 from docxpand.image import Image
-from docxpand.utils import guess_mimetype
+from docxpand.utils import guess_mimetype, iso_utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +59,6 @@ def extract_image_fields_from_svgs(
             )
         canvas = Canvas(filename)
         fields = doc_entry["annotations"][0]["fields"]
-        href_key = f"{{{XLINK_NS}}}href"
         factors = {  # resize factor to reduce output size
             "barcode": 1.0,
             "datamatrix": 0.25,
@@ -91,7 +89,7 @@ def extract_image_fields_from_svgs(
                     if doc_id.endswith(side):  # don't do it on wrong side
                         # Load image from base64 encoded string in SVG
                         image_element = canvas.element_by_id(f"{field_name}_image")
-                        encoded = image_element.attrib[href_key]
+                        encoded = image_element.attrib[XLINK_HREF]
                         field_image = Image.base64decode(encoded)
 
                         # Resize and select format to optimize weight
@@ -118,7 +116,7 @@ def extract_image_fields_from_svgs(
         "documents": documents,
         "info": {
             "author": getpass.getuser(),
-            "createdAt": datetime.datetime.utcnow().isoformat(),
+            "createdAt": iso_utc_now(),
             "description": input_dataset.info().get("description"),
             "name": input_dataset.info().get("name")
         }
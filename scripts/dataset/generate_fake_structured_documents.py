@@ -1,4 +1,3 @@
-import datetime
 import getpass
 import logging
 import typing as tp
@@ -6,8 +5,9 @@ import typing as tp
 import click
 from docxpand.dataset import DocFakerDataset
 
-from docxpand.generator import Generator
+from docxpand.generator import Generator, document_seeds, seed_random_generators
 from docxpand.svg_to_image import ChromeSVGRenderer
+from docxpand.utils import iso_utc_now
 
 logger = logging.getLogger(__name__)
 import os
@@ -43,11 +43,28 @@ import os
     required=True,
     help="URL pointing to Stable Diffusion API, used to generate identity photos.",
 )
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    required=False,
+    default=1,
+    help="Number of processes generating documents in parallel.",
+)
+@click.option(
+    "--seed",
+    type=int,
+    required=False,
+    default=None,
+    help="Seed making the generated data reproducible.",
+)
 def generate_fake_structured_documents(
     template: str,
     number: int,
     output_directory: str,
     stable_diffusion_api_url: str,
+    workers: int,
+    seed: tp.Optional[int],
 ) -> None:
     """Generate fake structured documents from an SVG template."""
     os.makedirs(os.path.abspath(output_directory), exist_ok=True)
@@ -61,24 +78,31 @@ def generate_fake_structured_documents(
             "Please set a new output directory, or remove the existing files."
         )
     generator = Generator(template, None, stable_diffusion_api_url or "")
-    all_docs = []
-    for _ in range(number):
-        try:
-            side_entries = generator.generate_images(output_directory)
-        except Exception as err:
-            logger.warning(
-                f"Got an error while generating images ({type(err)}: {err}), "
-                "continuing..."
-            )
-            continue
-        all_docs.extend(side_entries)
+    if workers > 1:
+        all_docs = generator.generate_dataset(
+            number, output_directory, workers, seed=seed
+        )
+    else:
+        all_docs = []
+        for document_seed in document_seeds(seed, number):
+            if document_seed is not None:
+                seed_random_generators(document_seed)
+            try:
+                side_entries = generator.generate_images(output_directory)
+            except Exception as err:
+                logger.warning(
+                    f"Got an error while generating images ({type(err)}: {err}), "
+                    "continuing..."
+                )
+                continue
+            all_docs.extend(side_entries)
     dataset = DocFakerDataset(
         {
             "__class__": "DocFakerDataset",
             "documents": all_docs,
             "info": {
                 "author": getpass.getuser(),
-                "createdAt": datetime.datetime.utcnow().isoformat(),
+                "createdAt": iso_utc_now(),
                 "description": (
                     f"Generated document images for template {template}."
                 ),
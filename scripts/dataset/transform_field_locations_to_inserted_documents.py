@@ -1,5 +1,4 @@
 """Script to transform field locations from generated to inserted documents."""
-import datetime
 import getpass
 import logging
 import os
@@ -8,7 +7,8 @@ import click
 import tqdm
 
 from docxpand.dataset import DocFakerDataset
-from docxpand.geometry import Quadrangle, BoundingBox, estimate_doc_homography, project_quad_to_target_image
+from docxpand.geometry import Quadrangle, BoundingBox, estimate_doc_homography, project_quads_to_target_image
+from docxpand.utils import iso_utc_now
 
 
 logger = logging.getLogger(__name__)
@@ -69,16 +69,24 @@ def transform_field_locations_to_inserted_documents(
             # Only process the right side
             if not doc_id.endswith(side):
                 continue
+            positioned_fields = []
             for field_name, field_value in fields[side].items():
                 original_field_value = original_fields[side][field_name]
                 original_field_position = original_field_value.get("position")
                 field_value["position"] = original_field_position
                 if original_field_position:
-                    original_bbox = BoundingBox.from_dict(original_field_position)
-                    field_quad = project_quad_to_target_image(
-                        original_bbox.to_quad(), homography
-                    )
-                    field_value["position"] = field_quad.to_dict()
+                    positioned_fields.append(field_value)
+
+            # Project all fields of the side at once
+            field_quads = project_quads_to_target_image(
+                [
+                    BoundingBox.from_dict(field_value["position"]).to_quad()
+                    for field_value in positioned_fields
+                ],
+                homography,
+            )
+            for field_value, field_quad in zip(positioned_fields, field_quads):
+                field_value["position"] = field_quad.to_dict()
 
         documents.append(doc_entry)
 
@@ -87,7 +95,7 @@ def transform_field_locations_to_inserted_documents(
         "documents": documents,
         "info": {
             "author": getpass.getuser(),
-            "createdAt": datetime.datetime.utcnow().isoformat(),
+            "createdAt": iso_utc_now(),
             "description": inserted_dataset.info().get("description"),
             "name": inserted_dataset.info().get("name")
         }